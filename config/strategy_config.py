@@ -1,8 +1,11 @@
-from dataclasses import dataclass
-from typing import Optional
+import copy
+import json
+import os
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Tuple
 
 
-@dataclass
+@dataclass(slots=True)
 class IndicatorConfig:
     # RSI settings
     rsi_period: int = 14
@@ -23,7 +26,7 @@ class IndicatorConfig:
     atr_multiplier: float = 2.0
 
 
-@dataclass
+@dataclass(slots=True)
 class PatternConfig:
     # Candlestick pattern thresholds
     doji_threshold: float = 0.1
@@ -36,7 +39,7 @@ class PatternConfig:
     consolidation_threshold: float = 0.2
 
 
-@dataclass
+@dataclass(slots=True)
 class RiskConfig:
     # Position sizing
     initial_capital: float = 100000
@@ -55,7 +58,7 @@ class RiskConfig:
     max_sector_exposure: float = 0.3
 
 
-@dataclass
+@dataclass(slots=True)
 class BacktestConfig:
     start_date: Optional[str] = None
     end_date: Optional[str] = None
@@ -71,12 +74,12 @@ class BacktestConfig:
             self.symbols = ['SPY']  # Default to S&P 500 ETF
 
 
-@dataclass
+@dataclass(slots=True)
 class StrategyConfig:
-    indicators: IndicatorConfig = IndicatorConfig()
-    patterns: PatternConfig = PatternConfig()
-    risk: RiskConfig = RiskConfig()
-    backtest: BacktestConfig = BacktestConfig()
+    indicators: IndicatorConfig = field(default_factory=IndicatorConfig)
+    patterns: PatternConfig = field(default_factory=PatternConfig)
+    risk: RiskConfig = field(default_factory=RiskConfig)
+    backtest: BacktestConfig = field(default_factory=BacktestConfig)
 
     # Strategy-specific settings
     require_volume_confirmation: bool = True
@@ -101,6 +104,54 @@ class StrategyConfig:
         # Add more validation as needed
         return True
 
+    @classmethod
+    def from_dict(cls, raw: dict) -> 'StrategyConfig':
+        """Build a configuration from nested dicts keyed like the dataclasses"""
+        sections = {
+            'indicators': IndicatorConfig,
+            'patterns': PatternConfig,
+            'risk': RiskConfig,
+            'backtest': BacktestConfig
+        }
+
+        kwargs = {}
+        for key, value in raw.items():
+            if key in sections:
+                kwargs[key] = sections[key](**(value or {}))
+            else:
+                kwargs[key] = value
+
+        return cls(**kwargs)
+
+
+# Parsed and validated configurations keyed on (absolute path, mtime)
+_CONFIG_CACHE: Dict[Tuple[str, float], StrategyConfig] = {}
+
+
+def load_config(path: str) -> StrategyConfig:
+    """
+    Load a configuration from a YAML or JSON file
+    Parsed files are cached until their modification time changes; each
+    call returns a copy so callers can override fields freely
+    """
+    path = os.path.abspath(path)
+    key = (path, os.stat(path).st_mtime)
+
+    config = _CONFIG_CACHE.get(key)
+    if config is None:
+        with open(path) as f:
+            if path.endswith('.json'):
+                raw = json.load(f)
+            else:
+                import yaml
+                raw = yaml.safe_load(f)
+
+        config = StrategyConfig.from_dict(raw or {})
+        config.validate()
+        _CONFIG_CACHE[key] = config
+
+    return copy.deepcopy(config)
+
 
 # Default configuration
 DEFAULT_CONFIG = StrategyConfig()
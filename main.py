@@ -1,10 +1,13 @@
 import pandas as pd
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from datetime import datetime
 from pathlib import Path
+from typing import Dict, Optional, Tuple
 import logging
 import argparse
+import os
 
-from config.strategy_config import StrategyConfig, DEFAULT_CONFIG
+from config.strategy_config import StrategyConfig, DEFAULT_CONFIG, load_config
 from src.patterns.candlestick_patterns import CandlestickPatterns
 from src.patterns.momentum_patterns import MomentumPatterns
 from src.indicators.momentum_indicators import MomentumIndicators, IndicatorParams
@@ -65,77 +68,102 @@ def setup_strategy(config: StrategyConfig):
     return entry_rules, exit_rules
 
 
+def _run_one(symbol: str, config: StrategyConfig,
+             start_date: Optional[datetime], end_date: Optional[datetime],
+             output_root: Path) -> Tuple[str, Dict]:
+    """Load, backtest and report one symbol"""
+    logger.info(f"Loading data for {symbol}...")
+    data_loader = DataLoader()
+    df = data_loader.load_from_yahoo(
+        symbol,
+        start_date=start_date,
+        end_date=end_date
+    )
+    df = data_loader.preprocess_data(df)
+
+    logger.info(f"Running backtest for {symbol}...")
+
+    # Initialize strategy components
+    entry_rules, exit_rules = setup_strategy(config)
+
+    # Calculate indicators used by the strategy rules
+    entry_rules.momentum_indicators.add_indicators(df)
+    entry_rules.volatility_indicators.add_indicators(df)
+
+    backtest_engine = BacktestEngine(
+        entry_rules,
+        exit_rules,
+        initial_capital=config.risk.initial_capital,
+        position_size=config.risk.position_size
+    )
+
+    results = backtest_engine.run(df)
+
+    # Calculate performance metrics
+    metrics = PerformanceMetrics.calculate_metrics(
+        results['trades'],
+        results['equity_curve']
+    )
+
+    # Generate and save visualizations
+    visualizer = StrategyVisualizer()
+
+    # Create trading chart
+    chart = visualizer.create_trading_chart(
+        df,
+        results['trades'],
+        indicators=['RSI', 'MACD', 'BB_Upper', 'BB_Lower']
+    )
+
+    # Create performance dashboard
+    dashboard = visualizer.create_performance_dashboard(metrics)
+
+    # Save visualizations
+    output_dir = output_root / symbol
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    visualizer.save_html(chart, output_dir / 'trading_chart.html')
+    visualizer.save_html(dashboard, output_dir / 'performance_dashboard.html')
+
+    # Generate and save report
+    report = PerformanceMetrics.generate_report(metrics)
+    with open(output_dir / 'performance_report.txt', 'w') as f:
+        f.write(report)
+
+    logger.info(f"Results saved to {output_dir}")
+
+    return symbol, results
+
+
 def run_backtest(config: StrategyConfig = DEFAULT_CONFIG):
     """Run strategy backtest"""
     logger.info("Starting strategy backtest...")
 
     try:
-        # Load data
-        data_loader = DataLoader()
-        dfs = {}
-
-        for symbol in config.backtest.symbols:
-            logger.info(f"Loading data for {symbol}...")
-            df = data_loader.load_from_yahoo(
-                symbol,
-                start_date=datetime.strptime(
-                    config.backtest.start_date, '%Y-%m-%d') if config.backtest.start_date else None,
-                end_date=datetime.strptime(
-                    config.backtest.end_date, '%Y-%m-%d') if config.backtest.end_date else None
-            )
-            dfs[symbol] = data_loader.preprocess_data(df)
-
-        # Initialize strategy components
-        entry_rules, exit_rules = setup_strategy(config)
-
-        # Run backtest for each symbol
-        all_results = {}
-        for symbol, df in dfs.items():
-            logger.info(f"Running backtest for {symbol}...")
-
-            backtest_engine = BacktestEngine(
-                entry_rules,
-                exit_rules,
-                initial_capital=config.risk.initial_capital,
-                position_size=config.risk.position_size
-            )
-
-            results = backtest_engine.run(df)
-            all_results[symbol] = results
-
-            # Calculate performance metrics
-            metrics = PerformanceMetrics.calculate_metrics(
-                results['trades'],
-                results['equity_curve']
-            )
-
-            # Generate and save visualizations
-            visualizer = StrategyVisualizer()
-
-            # Create trading chart
-            chart = visualizer.create_trading_chart(
-                df,
-                results['trades'],
-                indicators=['RSI', 'MACD', 'BB_Upper', 'BB_Lower']
-            )
-
-            # Create performance dashboard
-            dashboard = visualizer.create_performance_dashboard(metrics)
-
-            # Save visualizations
-            output_dir = Path('output') / \
-                datetime.now().strftime('%Y%m%d_%H%M%S') / symbol
-            output_dir.mkdir(parents=True, exist_ok=True)
-
-            chart.write_html(output_dir / 'trading_chart.html')
-            dashboard.write_html(output_dir / 'performance_dashboard.html')
-
-            # Generate and save report
-            report = PerformanceMetrics.generate_report(metrics)
-            with open(output_dir / 'performance_report.txt', 'w') as f:
-                f.write(report)
-
-            logger.info(f"Results saved to {output_dir}")
+        start_date = datetime.strptime(
+            config.backtest.start_date, '%Y-%m-%d') if config.backtest.start_date else None
+        end_date = datetime.strptime(
+            config.backtest.end_date, '%Y-%m-%d') if config.backtest.end_date else None
+
+        # Load and backtest each symbol in parallel; symbols are
+        # independent, so each worker runs the whole per-symbol pipeline
+        symbols = list(dict.fromkeys(config.backtest.symbols))
+        if not symbols:
+            return {}
+        output_root = Path('output') / datetime.now().strftime('%Y%m%d_%H%M%S')
+        symbol_results = {}
+        with ProcessPoolExecutor(
+                max_workers=min(len(symbols), os.cpu_count() or 1)) as executor:
+            futures = [
+                executor.submit(_run_one, symbol, config,
+                                start_date, end_date, output_root)
+                for symbol in symbols
+            ]
+            for future in as_completed(futures):
+                symbol, results = future.result()
+                symbol_results[symbol] = results
+
+        all_results = {symbol: symbol_results[symbol] for symbol in symbols}
 
         return all_results
 
@@ -159,8 +187,7 @@ def main():
     # Load configuration
     config = DEFAULT_CONFIG
     if args.config:
-        # Load custom config from file
-        pass
+        config = load_config(args.config)
 
     # Override config with command line arguments
     if args.symbols:
@@ -1,16 +1,34 @@
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Optional
+from typing import Dict, Optional, Tuple
 from dataclasses import dataclass
 from ..strategy.entry_rules import EntryRules
 from ..strategy.exit_rules import ExitRules
+from .trade_log import TradeLog
+from ..utils.jit import njit
 
 
-@dataclass
+# Columns read by the strategy rules on every bar
+BAR_COLUMNS = (
+    'Open', 'High', 'Low', 'Close', 'Volume',
+    'ATR', 'RSI', 'MACD_Hist', 'MACD_Bull_Cross', 'MACD_Bear_Cross',
+    'BB_Upper', 'BB_Lower',
+    'Historical_Volatility', 'HV_Avg', 'Volatility_Regime', 'Trend_Strength',
+    'Stop_Distance', 'Take_Profit_Distance'
+)
+
+# Bars needed before the indicators support a new entry
+WARMUP_BARS = 20
+
+# Exit reasons, indexed by the codes _run_core records
+EXIT_REASONS = ('Stop', 'Target', 'Signal')
+
+
+@dataclass(slots=True)
 class Position:
     type: str  # 'long' or 'short'
     entry_price: float
-    entry_time: pd.Timestamp
+    entry_time: np.datetime64
     size: float
     stop_loss: float
     take_profit: float
@@ -18,6 +36,129 @@ class Position:
     trade_id: int
 
 
+def bar_arrays(df: pd.DataFrame, columns: Tuple[str, ...] = BAR_COLUMNS
+               ) -> Dict[str, np.ndarray]:
+    """
+    Build the per-bar column bundle the strategy rules index by bar
+    Float columns are contiguous float64 so the Numba kernels get one
+    array type; flag and regime columns keep their dtype
+    """
+    arrays = {}
+    for name in columns:
+        values = df[name].to_numpy()
+        if values.dtype.kind == 'f':
+            arrays[name] = np.ascontiguousarray(values, dtype=np.float64)
+        else:
+            arrays[name] = np.ascontiguousarray(values)
+    return arrays
+
+
+@njit(cache=True)
+def _run_core(high, low, close, bullish_entry, bearish_entry, sizes,
+              stop_distance, take_profit_distance, long_trail, short_trail,
+              exit_long, exit_short, initial_capital, warmup, equity_curve):
+    """
+    Bar loop over precomputed per-bar arrays, with the open position
+    held in local scalars
+    equity_curve: preallocated output, filled with equity after each bar
+    Returns: (final_equity, entry_idx, exit_idx, is_long, entry_price,
+              exit_price, size, pnl, exit_code, open_position)
+    """
+    n = close.shape[0]
+    # A trade spans at least two bars: entry and a later exit
+    max_trades = n // 2 + 1
+    entry_idx = np.empty(max_trades, np.int64)
+    exit_idx = np.empty(max_trades, np.int64)
+    is_long = np.empty(max_trades, np.bool_)
+    entry_price = np.empty(max_trades)
+    exit_price = np.empty(max_trades)
+    size = np.empty(max_trades)
+    pnl = np.empty(max_trades)
+    exit_code = np.empty(max_trades, np.int8)
+
+    equity = initial_capital
+    count = 0
+    in_position = False
+    pos_long = False
+    pos_entry_idx = 0
+    pos_entry = 0.0
+    pos_size = 0.0
+    pos_stop = 0.0
+    pos_tp = 0.0
+
+    # No position can be open during warm-up, so equity is flat
+    for idx in range(warmup):
+        equity_curve[idx] = equity
+
+    for idx in range(warmup, n):
+        if in_position:
+            # Trailing stop, bounded by the entry price like
+            # ExitRules.calculate_trailing_stop
+            if pos_long:
+                bound = pos_entry * 0.99
+                trail = long_trail[idx]
+                stop = bound if bound > trail else trail
+                hit_stop = low[idx] <= stop
+                hit_target = high[idx] >= pos_tp
+                signal_exit = exit_long[idx]
+            else:
+                bound = pos_entry * 1.01
+                trail = short_trail[idx]
+                stop = bound if bound < trail else trail
+                hit_stop = high[idx] >= stop
+                hit_target = low[idx] <= pos_tp
+                signal_exit = exit_short[idx]
+
+            if hit_stop or hit_target or signal_exit:
+                if hit_stop:
+                    price = stop
+                    code = 0
+                elif hit_target:
+                    price = pos_tp
+                    code = 1
+                else:
+                    price = close[idx]
+                    code = 2
+
+                if pos_long:
+                    trade_pnl = (price - pos_entry) * pos_size
+                else:
+                    trade_pnl = (pos_entry - price) * pos_size
+                equity += trade_pnl
+
+                entry_idx[count] = pos_entry_idx
+                exit_idx[count] = idx
+                is_long[count] = pos_long
+                entry_price[count] = pos_entry
+                exit_price[count] = price
+                size[count] = pos_size
+                pnl[count] = trade_pnl
+                exit_code[count] = code
+                count += 1
+                in_position = False
+
+        elif bullish_entry[idx] or bearish_entry[idx]:
+            pos_long = bullish_entry[idx]
+            pos_entry_idx = idx
+            pos_entry = close[idx]
+            pos_size = sizes[idx]
+            if pos_long:
+                pos_stop = pos_entry - stop_distance[idx]
+                pos_tp = pos_entry + take_profit_distance[idx]
+            else:
+                pos_stop = pos_entry + stop_distance[idx]
+                pos_tp = pos_entry - take_profit_distance[idx]
+            in_position = True
+
+        equity_curve[idx] = equity
+
+    open_position = (in_position, pos_long, pos_entry_idx, pos_entry,
+                     pos_size, pos_stop, pos_tp)
+    return (equity, entry_idx[:count], exit_idx[:count],
+            is_long[:count], entry_price[:count], exit_price[:count],
+            size[:count], pnl[:count], exit_code[:count], open_position)
+
+
 class BacktestEngine:
     def __init__(self,
                  entry_rules: EntryRules,
@@ -30,163 +171,98 @@ class BacktestEngine:
         self.position_size = position_size
         self.reset()
 
-    def reset(self):
-        """Reset backtest state"""
+    def reset(self, n_bars: int = 0):
+        """Reset backtest state for a run over n_bars bars"""
         self.equity = self.initial_capital
         self.current_position: Optional[Position] = None
-        self.trades: List[Dict] = []
-        self.equity_curve = []
+        self.trades = TradeLog()
+        self.equity_curve = np.empty(n_bars, dtype=np.float64)
         self.trade_count = 0
+        self.signals: Optional[Dict[str, np.ndarray]] = None
+        self.dynamic_stops: Optional[Tuple[np.ndarray, np.ndarray]] = None
+        self.trail_levels: Optional[Tuple[np.ndarray, np.ndarray]] = None
 
     def run(self, df: pd.DataFrame) -> Dict:
         """Run backtest on historical data"""
-        self.reset()
-        results = []
-
-        for idx in range(len(df)):
-            equity_snapshot = self.process_bar(df, idx)
-            self.equity_curve.append(equity_snapshot)
-
-        return self._generate_results()
-
-    def process_bar(self, df: pd.DataFrame, idx: int) -> float:
-        """Process single price bar"""
-        current_bar = df.iloc[idx]
-
-        # Update position if exists
-        if self.current_position is not None:
-            self._check_position_exit(df, idx)
-
-        # Check for new entry if no position
-        elif idx >= 20:  # Need enough bars for indicators
-            self._check_new_entry(df, idx)
-
-        return self.equity
-
-    def _check_position_exit(self, df: pd.DataFrame, idx: int):
-        """Check and process position exits"""
-        current_bar = df.iloc[idx]
-        position = self.current_position
-
-        # Update trailing stop
-        new_trailing_stop = self.exit_rules.calculate_trailing_stop(
-            df, idx, position.type, position.entry_price
+        self.reset(len(df))
+
+        # Evaluate every per-bar rule up front so the bar loop only
+        # tracks the open position
+        cols = bar_arrays(df)
+        self.signals = self.entry_rules.momentum_indicators.precompute_signals(
+            df)
+        patterns = {
+            **self.entry_rules.candlestick_patterns.precompute_patterns(cols),
+            **self.entry_rules.momentum_patterns.precompute_patterns(cols)
+        }
+        bullish_entry, bearish_entry = self.entry_rules.precompute_entry_signals(
+            cols, self.signals, patterns)
+        exit_long, exit_short = self.exit_rules.precompute_exit_signals(
+            cols, self.signals, patterns)
+        sizes = self.entry_rules.precompute_position_sizes(
+            cols, patterns, self.position_size)
+        self.dynamic_stops = (
+            self.exit_rules.volatility_indicators.precompute_dynamic_stops(df)
         )
-        position.trailing_stop = new_trailing_stop
-
-        # Check stop loss and take profit
-        hit_stop = (
-            position.type == 'long' and current_bar['Low'] <= position.trailing_stop or
-            position.type == 'short' and current_bar['High'] >= position.trailing_stop
+        self.trail_levels = self.exit_rules.precompute_trailing_stops(
+            df, self.dynamic_stops[0])
+
+        core = _run_core(
+            cols['High'], cols['Low'], cols['Close'],
+            bullish_entry, bearish_entry, sizes,
+            self.dynamic_stops[0], self.dynamic_stops[1],
+            self.trail_levels[0], self.trail_levels[1],
+            exit_long, exit_short,
+            float(self.initial_capital), min(WARMUP_BARS, len(df)),
+            self.equity_curve
         )
-
-        hit_target = (
-            position.type == 'long' and current_bar['High'] >= position.take_profit or
-            position.type == 'short' and current_bar['Low'] <= position.take_profit
-        )
-
-        # Check exit signals
-        should_exit, exit_details = self.exit_rules.check_exit_signals(
-            df, idx, position.type
+        self._unpack_core(core, df.index)
+
+        return self._generate_results(df.index)
+
+    def _unpack_core(self, core: Tuple, index: pd.Index):
+        """Load _run_core output into the engine state"""
+        (final_equity, entry_idx, exit_idx, is_long, entry_price, exit_price,
+         size, pnl, exit_code, open_position) = core
+        times = index.values
+
+        self.equity = final_equity
+        self.trade_count = len(pnl)
+
+        types = np.where(is_long, 'long', 'short')
+        self.trades = TradeLog(
+            id=list(range(1, len(pnl) + 1)),
+            type=types.tolist(),
+            entry_time=list(times[entry_idx]),
+            entry_price=list(entry_price),
+            exit_time=list(times[exit_idx]),
+            exit_price=list(exit_price),
+            size=list(size),
+            pnl=list(pnl),
+            exit_reason=[EXIT_REASONS[code] for code in exit_code],
+            tz=getattr(index, 'tz', None)
         )
 
-        if hit_stop or hit_target or should_exit:
-            exit_price = (
-                position.trailing_stop if hit_stop else
-                position.take_profit if hit_target else
-                current_bar['Close']
+        # Position still open at the last bar
+        in_position, pos_long, pos_entry_idx, pos_entry, pos_size, \
+            pos_stop, pos_tp = open_position
+        if in_position:
+            self.trade_count += 1
+            self.current_position = Position(
+                type='long' if pos_long else 'short',
+                entry_price=pos_entry,
+                entry_time=times[pos_entry_idx],
+                size=pos_size,
+                stop_loss=pos_stop,
+                take_profit=pos_tp,
+                trailing_stop=pos_stop,
+                trade_id=self.trade_count
             )
 
-            self._close_position(exit_price, df.index[idx], 'Stop' if hit_stop else
-                                 'Target' if hit_target else 'Signal')
-
-    def _check_new_entry(self, df: pd.DataFrame, idx: int):
-        """Check and process new position entries"""
-        bullish, bearish, signal_details = self.entry_rules.check_entry_signals(
-            df, idx)
-
-        if bullish or bearish:
-            position_type = 'long' if bullish else 'short'
-            entry_price = df['Close'].iloc[idx]
-
-            # Calculate position size and stops
-            size = self.entry_rules.calculate_position_size(
-                df, idx, self.position_size
-            )
-
-            stop_distance, take_profit_distance = (
-                self.exit_rules.volatility_indicators.get_dynamic_stops(
-                    df, idx)
-            )
-
-            stop_loss = (
-                entry_price - stop_distance if position_type == 'long'
-                else entry_price + stop_distance
-            )
-
-            take_profit = (
-                entry_price + take_profit_distance if position_type == 'long'
-                else entry_price - take_profit_distance
-            )
-
-            self._open_position(
-                position_type,
-                entry_price,
-                df.index[idx],
-                size,
-                stop_loss,
-                take_profit
-            )
-
-    def _open_position(self, type: str, price: float, time: pd.Timestamp,
-                       size: float, stop_loss: float, take_profit: float):
-        """Open new position"""
-        self.trade_count += 1
-        self.current_position = Position(
-            type=type,
-            entry_price=price,
-            entry_time=time,
-            size=size,
-            stop_loss=stop_loss,
-            take_profit=take_profit,
-            trailing_stop=stop_loss,
-            trade_id=self.trade_count
-        )
-
-    def _close_position(self, exit_price: float, exit_time: pd.Timestamp,
-                        exit_reason: str):
-        """Close current position and record trade"""
-        position = self.current_position
-
-        # Calculate P&L
-        if position.type == 'long':
-            pnl = (exit_price - position.entry_price) * position.size
-        else:
-            pnl = (position.entry_price - exit_price) * position.size
-
-        # Update equity
-        self.equity += pnl
-
-        # Record trade
-        trade = {
-            'id': position.trade_id,
-            'type': position.type,
-            'entry_time': position.entry_time,
-            'entry_price': position.entry_price,
-            'exit_time': exit_time,
-            'exit_price': exit_price,
-            'size': position.size,
-            'pnl': pnl,
-            'exit_reason': exit_reason
-        }
-        self.trades.append(trade)
-
-        # Clear position
-        self.current_position = None
-
-    def _generate_results(self) -> Dict:
+    def _generate_results(self, index: pd.Index) -> Dict:
         """Generate backtest results summary"""
-        equity_curve = pd.Series(self.equity_curve)
+        equity_curve = pd.Series(self.equity_curve, index=index, copy=False)
+        pnl = self.trades.column('pnl')
 
         results = {
             'initial_capital': self.initial_capital,
@@ -195,8 +271,8 @@ class BacktestEngine:
             'trades': self.trades,
             'equity_curve': equity_curve,
             'trade_count': len(self.trades),
-            'win_rate': sum(1 for t in self.trades if t['pnl'] > 0) / len(self.trades),
-            'average_trade': np.mean([t['pnl'] for t in self.trades]),
+            'win_rate': (pnl > 0).sum() / len(self.trades),
+            'average_trade': pnl.mean(),
             'max_drawdown': self._calculate_max_drawdown(equity_curve)
         }
 
@@ -205,6 +281,7 @@ class BacktestEngine:
     @staticmethod
     def _calculate_max_drawdown(equity_curve: pd.Series) -> float:
         """Calculate maximum drawdown"""
-        rolling_max = equity_curve.expanding().max()
-        drawdowns = equity_curve - rolling_max
+        equity = equity_curve.to_numpy()
+        rolling_max = np.maximum.accumulate(equity)
+        drawdowns = equity - rolling_max
         return abs(drawdowns.min())
@@ -1,38 +1,44 @@
 import pandas as pd
 import numpy as np
-from typing import List, Dict
+from typing import List, Dict, Union
 from datetime import datetime
+from .trade_log import TradeLog
 
 
 class PerformanceMetrics:
     @staticmethod
-    def calculate_metrics(trades: List[Dict], equity_curve: pd.Series) -> Dict:
+    def calculate_metrics(trades: Union[TradeLog, List[Dict]],
+                          equity_curve: pd.Series) -> Dict:
         """Calculate comprehensive performance metrics"""
         if not trades:
             return {}
 
-        # Convert trades to DataFrame
-        trades_df = pd.DataFrame(trades)
-        trades_df['entry_time'] = pd.to_datetime(trades_df['entry_time'])
-        trades_df['exit_time'] = pd.to_datetime(trades_df['exit_time'])
+        if not isinstance(trades, TradeLog):
+            trades = TradeLog.from_records(trades)
+
+        entry_time = trades.column('entry_time')
+        exit_time = trades.column('exit_time')
+        trade_types = trades.column('type')
 
         # Basic metrics
+        pnl = trades.column('pnl').astype(float)
+        wins_mask = pnl > 0
+        winning_pnl = pnl[wins_mask]
+        losing_pnl = pnl[~wins_mask]
+
         total_trades = len(trades)
-        winning_trades = sum(1 for t in trades if t['pnl'] > 0)
+        winning_trades = int(wins_mask.sum())
         losing_trades = total_trades - winning_trades
 
         win_rate = winning_trades / total_trades if total_trades > 0 else 0
 
         # P&L metrics
-        total_pnl = sum(t['pnl'] for t in trades)
-        average_win = np.mean(
-            [t['pnl'] for t in trades if t['pnl'] > 0]) if winning_trades > 0 else 0
-        average_loss = np.mean(
-            [t['pnl'] for t in trades if t['pnl'] <= 0]) if losing_trades > 0 else 0
+        total_pnl = pnl.sum()
+        average_win = winning_pnl.mean() if winning_pnl.size else 0
+        average_loss = losing_pnl.mean() if losing_pnl.size else 0
 
         profit_factor = (
-            sum(t['pnl'] for t in trades if t['pnl'] > 0) /
-            abs(sum(t['pnl'] for t in trades if t['pnl'] <= 0))
+            winning_pnl.sum() / abs(losing_pnl.sum())
         ) if losing_trades > 0 else float('inf')
 
         # Risk metrics
@@ -41,12 +47,14 @@ class PerformanceMetrics:
         sharpe_ratio = np.sqrt(252) * (returns.mean() /
                                        returns.std()) if len(returns) > 0 else 0
 
-        rolling_max = equity_curve.expanding().max()
-        drawdowns = (equity_curve - rolling_max) / rolling_max
-        max_drawdown = abs(drawdowns.min())
+        equity = equity_curve.to_numpy()
+        rolling_max = np.maximum.accumulate(equity)
+        drawdown_values = (equity - rolling_max) / rolling_max
+        max_drawdown = abs(drawdown_values.min())
+        drawdowns = pd.Series(drawdown_values, index=equity_curve.index)
 
         # Time-based metrics
-        duration = trades_df['exit_time'] - trades_df['entry_time']
+        duration = pd.TimedeltaIndex(exit_time - entry_time)
         avg_trade_duration = duration.mean()
 
         # Monthly returns
@@ -55,8 +63,7 @@ class PerformanceMetrics:
         )
 
         # Calculate MAR ratio (annualized return / max drawdown)
-        total_days = (trades_df['exit_time'].max() -
-                      trades_df['entry_time'].min()).days
+        total_days = pd.Timedelta(exit_time.max() - entry_time.min()).days
         annualized_return = (
             (1 + total_pnl/equity_curve.iloc[0]) ** (365/total_days)) - 1
         mar_ratio = annualized_return / \
@@ -81,12 +88,12 @@ class PerformanceMetrics:
             'annualized_return': annualized_return,
 
             # Additional trade analysis
-            'long_trades': len(trades_df[trades_df['type'] == 'long']),
-            'short_trades': len(trades_df[trades_df['type'] == 'short']),
+            'long_trades': int((trade_types == 'long').sum()),
+            'short_trades': int((trade_types == 'short').sum()),
             'avg_trade_pnl': total_pnl / total_trades if total_trades > 0 else 0,
-            'best_trade': max(t['pnl'] for t in trades) if trades else 0,
-            'worst_trade': min(t['pnl'] for t in trades) if trades else 0,
-            'exit_reasons': trades_df['exit_reason'].value_counts().to_dict(),
+            'best_trade': pnl.max(),
+            'worst_trade': pnl.min(),
+            'exit_reasons': pd.Series(trades.exit_reason).value_counts().to_dict(),
 
             # Trade timing analysis
             'avg_bars_held': duration.mean().total_seconds() / (60 * 60 * 24),  # Convert to days
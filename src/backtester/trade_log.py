@@ -0,0 +1,81 @@
+import numpy as np
+import pandas as pd
+from dataclasses import dataclass, field, fields
+from datetime import tzinfo
+from typing import Dict, Iterable, Iterator, List, Optional
+
+TIME_COLUMNS = ('entry_time', 'exit_time')
+
+
+@dataclass(slots=True)
+class TradeLog:
+    """
+    Closed trades stored column-wise, one list per trade field
+    Times are datetime64[ns] (UTC when tz is set)
+    """
+    id: List[int] = field(default_factory=list)
+    type: List[str] = field(default_factory=list)  # 'long' or 'short'
+    entry_time: List[np.datetime64] = field(default_factory=list)
+    entry_price: List[float] = field(default_factory=list)
+    exit_time: List[np.datetime64] = field(default_factory=list)
+    exit_price: List[float] = field(default_factory=list)
+    size: List[float] = field(default_factory=list)
+    pnl: List[float] = field(default_factory=list)
+    exit_reason: List[str] = field(default_factory=list)
+    tz: Optional[tzinfo] = None
+
+    @classmethod
+    def from_records(cls, trades: Iterable[Dict]) -> 'TradeLog':
+        """
+        Build a log from trade dicts keyed like the log columns
+        Records are converted column-wise in one DataFrame pass
+        """
+        names = [f.name for f in fields(cls) if f.name != 'tz']
+        frame = pd.DataFrame(list(trades), columns=names)
+
+        log = cls(**{name: frame[name].tolist() for name in names
+                     if name not in TIME_COLUMNS})
+        for name in TIME_COLUMNS:
+            times = pd.DatetimeIndex(frame[name])
+            if times.tz is not None:
+                log.tz = times.tz
+                times = times.tz_convert('UTC').tz_localize(None)
+            setattr(log, name, list(times.to_numpy()))
+        return log
+
+    def append(self, id: int, type: str, entry_time: np.datetime64,
+               entry_price: float, exit_time: np.datetime64, exit_price: float,
+               size: float, pnl: float, exit_reason: str):
+        """Record one closed trade"""
+        self.id.append(id)
+        self.type.append(type)
+        self.entry_time.append(entry_time)
+        self.entry_price.append(entry_price)
+        self.exit_time.append(exit_time)
+        self.exit_price.append(exit_price)
+        self.size.append(size)
+        self.pnl.append(pnl)
+        self.exit_reason.append(exit_reason)
+
+    def column(self, name: str) -> np.ndarray:
+        """Return one trade field as a NumPy array"""
+        if name in TIME_COLUMNS:
+            return np.asarray(getattr(self, name), dtype='datetime64[ns]')
+        return np.asarray(getattr(self, name))
+
+    def _to_timestamp(self, value: np.datetime64) -> pd.Timestamp:
+        if self.tz is None:
+            return pd.Timestamp(value)
+        return pd.Timestamp(value, tz='UTC').tz_convert(self.tz)
+
+    def __len__(self) -> int:
+        return len(self.id)
+
+    def __iter__(self) -> Iterator[Dict]:
+        """Iterate trades as dicts, for callers that want records"""
+        names = [f.name for f in fields(self) if f.name != 'tz']
+        for values in zip(*(getattr(self, name) for name in names)):
+            trade = dict(zip(names, values))
+            for name in TIME_COLUMNS:
+                trade[name] = self._to_timestamp(trade[name])
+            yield trade
@@ -1,8 +1,136 @@
 import numpy as np
 import pandas as pd
-import talib as ta
 from dataclasses import dataclass
-from typing import Tuple
+from typing import Dict, Tuple
+from ..utils.jit import njit, NUMBA_AVAILABLE
+
+try:
+    import talib as ta
+except ImportError:  # Indicators fall back to the fused kernel below
+    ta = None
+
+
+@njit(cache=True)
+def _trend_strength_kernel(close: np.ndarray, window: int) -> np.ndarray:
+    """Rolling closed-form regression slope over window + 1 bars, tanh-scaled"""
+    n = window + 1
+    sx = n * (n - 1) / 2.0
+    sxx = (n - 1) * n * (2 * n - 1) / 6.0
+    denom = n * sxx - sx * sx
+
+    out = np.zeros(close.shape[0])
+    for idx in range(window, close.shape[0]):
+        sy = 0.0
+        sxy = 0.0
+        for j in range(n):
+            y = close[idx - window + j]
+            sy += y
+            sxy += j * y
+        out[idx] = np.tanh((n * sxy - sx * sy) / denom * 100)
+    return out
+
+
+@njit(cache=True, fastmath=True)
+def _momentum_kernel(close: np.ndarray, rsi_period: int, macd_fast: int,
+                     macd_slow: int, macd_signal: int, bb_period: int,
+                     bb_std: float):
+    """
+    RSI, MACD and Bollinger Bands in a single pass over close
+    Follows TA-Lib's seeding (SMA-seeded EMAs, Wilder RSI) so values and
+    leading NaNs match ta.RSI, ta.MACD and ta.BBANDS
+
+    Returns: (rsi, macd, macd_signal, macd_hist, bb_upper, bb_middle, bb_lower)
+    """
+    n = close.shape[0]
+    rsi = np.full(n, np.nan)
+    macd = np.full(n, np.nan)
+    signal = np.full(n, np.nan)
+    hist = np.full(n, np.nan)
+    upper = np.full(n, np.nan)
+    middle = np.full(n, np.nan)
+    lower = np.full(n, np.nan)
+
+    # Wilder RSI state
+    avg_gain = 0.0
+    avg_loss = 0.0
+
+    # MACD state; the fast EMA is seeded on the bars ending where the
+    # slow EMA seed ends, so both start on the same bar
+    fast_k = 2.0 / (macd_fast + 1)
+    slow_k = 2.0 / (macd_slow + 1)
+    signal_k = 2.0 / (macd_signal + 1)
+    fast_start = macd_slow - macd_fast
+    fast_ema = 0.0
+    slow_ema = 0.0
+    signal_ema = 0.0
+
+    # Bollinger rolling sums
+    bb_sum = 0.0
+    bb_sum_sq = 0.0
+
+    for i in range(n):
+        c = close[i]
+
+        # RSI
+        if i > 0:
+            diff = c - close[i - 1]
+            gain = diff if diff > 0 else 0.0
+            loss = -diff if diff < 0 else 0.0
+            if i <= rsi_period:
+                avg_gain += gain
+                avg_loss += loss
+                if i == rsi_period:
+                    avg_gain /= rsi_period
+                    avg_loss /= rsi_period
+            else:
+                avg_gain = (avg_gain * (rsi_period - 1) + gain) / rsi_period
+                avg_loss = (avg_loss * (rsi_period - 1) + loss) / rsi_period
+            if i >= rsi_period:
+                total = avg_gain + avg_loss
+                rsi[i] = 100.0 * (avg_gain / total) if total != 0 else 0.0
+
+        # MACD
+        if i < macd_slow:
+            slow_ema += c
+            if i >= fast_start:
+                fast_ema += c
+            if i == macd_slow - 1:
+                slow_ema /= macd_slow
+                fast_ema /= macd_fast
+        else:
+            slow_ema = (c - slow_ema) * slow_k + slow_ema
+            fast_ema = (c - fast_ema) * fast_k + fast_ema
+
+        j = i - (macd_slow - 1)
+        if j >= 0:
+            line = fast_ema - slow_ema
+            if j < macd_signal:
+                signal_ema += line
+                if j == macd_signal - 1:
+                    signal_ema /= macd_signal
+            else:
+                signal_ema = (line - signal_ema) * signal_k + signal_ema
+            if j >= macd_signal - 1:
+                macd[i] = line
+                signal[i] = signal_ema
+                hist[i] = line - signal_ema
+
+        # Bollinger Bands (SMA +/- population std)
+        bb_sum += c
+        bb_sum_sq += c * c
+        if i >= bb_period:
+            old = close[i - bb_period]
+            bb_sum -= old
+            bb_sum_sq -= old * old
+        if i >= bb_period - 1:
+            mean = bb_sum / bb_period
+            var = bb_sum_sq / bb_period - mean * mean
+            std = np.sqrt(var) if var > 0 else 0.0
+            middle[i] = mean
+            upper[i] = mean + bb_std * std
+            lower[i] = mean - bb_std * std
+
+    return rsi, macd, signal, hist, upper, middle, lower
 
 
 @dataclass
@@ -21,36 +149,84 @@ class MomentumIndicators:
 
     def calculate_all(self, df: pd.DataFrame) -> pd.DataFrame:
         """Calculate all momentum indicators"""
-        df = df.copy()
+        return df.assign(**self.calculate_columns(df))
 
+    def add_indicators(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Add all momentum indicators to df in place, without the full
+        copy calculate_all makes
+        Returns: df
+        """
+        for name, values in self.calculate_columns(df).items():
+            df[name] = values
+        return df
+
+    def calculate_columns(self, df: pd.DataFrame) -> Dict[str, np.ndarray]:
+        """
+        Calculate all momentum indicators without copying df
+        Returns: dict of indicator arrays keyed by column name
+        """
+        close = df['Close'].to_numpy(dtype=np.float64)
+
+        if NUMBA_AVAILABLE or ta is None:
+            # RSI, MACD and Bollinger Bands in one fused pass over Close
+            rsi, macd, signal, hist, upper, middle, lower = _momentum_kernel(
+                close,
+                self.params.rsi_period,
+                self.params.macd_fast,
+                self.params.macd_slow,
+                self.params.macd_signal,
+                self.params.bb_period,
+                float(self.params.bb_std)
+            )
+        else:
+            rsi, macd, signal, hist, upper, middle, lower = (
+                self._calculate_with_talib(close))
+
+        # MACD crossovers: the histogram sign flips from -1 to +1 or back
+        hist_sign = np.sign(hist)
+        sign_change = np.diff(hist_sign, prepend=hist_sign[:1])
+
+        return {
+            'RSI': rsi,
+            'MACD': macd,
+            'MACD_Signal': signal,
+            'MACD_Hist': hist,
+            'MACD_Bull_Cross': sign_change == 2,
+            'MACD_Bear_Cross': sign_change == -2,
+            'BB_Upper': upper,
+            'BB_Middle': middle,
+            'BB_Lower': lower,
+            'Trend_Strength': self.calculate_trend_strength(close)
+        }
+
+    def _calculate_with_talib(self, close: np.ndarray) -> Tuple[np.ndarray, ...]:
+        """
+        Calculate RSI, MACD and Bollinger Bands using TA-Lib
+        Returns: (rsi, macd, macd_signal, macd_hist, bb_upper, bb_middle, bb_lower)
+        """
         # RSI
-        df['RSI'] = ta.RSI(df['Close'], timeperiod=self.params.rsi_period)
+        rsi = ta.RSI(close, timeperiod=self.params.rsi_period)
 
         # MACD
         macd, signal, hist = ta.MACD(
-            df['Close'],
+            close,
             fastperiod=self.params.macd_fast,
             slowperiod=self.params.macd_slow,
             signalperiod=self.params.macd_signal
         )
-        df['MACD'] = macd
-        df['MACD_Signal'] = signal
-        df['MACD_Hist'] = hist
 
         # Bollinger Bands
         upper, middle, lower = ta.BBANDS(
-            df['Close'],
+            close,
             timeperiod=self.params.bb_period,
             nbdevup=self.params.bb_std,
             nbdevdn=self.params.bb_std
         )
-        df['BB_Upper'] = upper
-        df['BB_Middle'] = middle
-        df['BB_Lower'] = lower
 
-        return df
+        return rsi, macd, signal, hist, upper, middle, lower
 
-    def get_momentum_signals(self, df: pd.DataFrame, idx: int) -> dict:
+    def get_momentum_signals(self, cols: Dict[str, np.ndarray], idx: int) -> dict:
         """Get momentum signals from indicators"""
         signals = {
             'rsi_overbought': False,
@@ -65,25 +241,46 @@ class MomentumIndicators:
             return signals
 
         # RSI signals
-        current_rsi = df['RSI'].iloc[idx]
+        current_rsi = cols['RSI'][idx]
         signals['rsi_overbought'] = current_rsi > 70
         signals['rsi_oversold'] = current_rsi < 30
 
         # MACD crossover signals
-        prev_hist = df['MACD_Hist'].iloc[idx-1]
-        curr_hist = df['MACD_Hist'].iloc[idx]
-        signals['macd_bullish_cross'] = prev_hist < 0 and curr_hist > 0
-        signals['macd_bearish_cross'] = prev_hist > 0 and curr_hist < 0
+        signals['macd_bullish_cross'] = cols['MACD_Bull_Cross'][idx]
+        signals['macd_bearish_cross'] = cols['MACD_Bear_Cross'][idx]
 
         # Bollinger Band breakouts
-        close = df['Close'].iloc[idx]
-        signals['bb_upper_break'] = close > df['BB_Upper'].iloc[idx]
-        signals['bb_lower_break'] = close < df['BB_Lower'].iloc[idx]
+        close = cols['Close'][idx]
+        signals['bb_upper_break'] = close > cols['BB_Upper'][idx]
+        signals['bb_lower_break'] = close < cols['BB_Lower'][idx]
+
+        return signals
+
+    def precompute_signals(self, df: pd.DataFrame) -> Dict[str, np.ndarray]:
+        """
+        Compute the get_momentum_signals flags for every bar at once
+        Returns: dict of boolean arrays keyed like get_momentum_signals
+        """
+        close = df['Close'].to_numpy()
+        rsi = df['RSI'].to_numpy()
+
+        signals = {
+            'rsi_overbought': rsi > 70,
+            'rsi_oversold': rsi < 30,
+            'macd_bullish_cross': df['MACD_Bull_Cross'].to_numpy(copy=True),
+            'macd_bearish_cross': df['MACD_Bear_Cross'].to_numpy(copy=True),
+            'bb_upper_break': close > df['BB_Upper'].to_numpy(),
+            'bb_lower_break': close < df['BB_Lower'].to_numpy()
+        }
+
+        # Match get_momentum_signals, which reports nothing on the first bar
+        for values in signals.values():
+            values[:1] = False
 
         return signals
 
     @staticmethod
-    def get_trend_strength(df: pd.DataFrame, idx: int, window: int = 50) -> float:
+    def get_trend_strength(cols: Dict[str, np.ndarray], idx: int, window: int = 50) -> float:
         """
         Calculate trend strength (-1 to 1)
         Positive values indicate uptrend, negative values indicate downtrend
@@ -91,86 +288,39 @@ class MomentumIndicators:
         if idx < window:
             return 0.0
 
-        # Calculate linear regression slope
-        prices = df['Close'].iloc[idx-window:idx+1]
-        x = np.arange(len(prices))
-        slope, _ = np.polyfit(x, prices, 1)
+        # Calculate linear regression slope (closed-form least squares)
+        prices = cols['Close'][idx-window:idx+1]
+        n = len(prices)
+        x = np.arange(n)
+        sx = x.sum()
+        denom = n * (x * x).sum() - sx * sx
+        slope = (n * np.dot(x, prices) - sx * prices.sum()) / denom
 
         # Normalize slope to -1 to 1 range
         # Adjust multiplier for sensitivity
         normalized_slope = np.tanh(slope * 100)
 
         return normalized_slope
-    
-    import numpy as np
-
 
-@dataclass
-class VolatilityParams:
-    atr_period: int = 14
-    volatility_lookback: int = 20
-
-
-class VolatilityIndicators:
-    def __init__(self, params: VolatilityParams = VolatilityParams()):
-        self.params = params
-
-    def calculate_all(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Calculate all volatility indicators"""
-        df = df.copy()
-
-        # ATR
-        df['ATR'] = ta.ATR(
-            df['High'],
-            df['Low'],
-            df['Close'],
-            timeperiod=self.params.atr_period
-        )
-
-        # Historical volatility (standard deviation of returns)
-        returns = df['Close'].pct_change()
-        df['Historical_Volatility'] = returns.rolling(
-            window=self.params.volatility_lookback
-        ).std() * np.sqrt(252)  # Annualized
-
-        return df
-
-    def get_dynamic_stops(self, df: pd.DataFrame, idx: int, multiplier: float = 2.0) -> tuple:
-        """Calculate dynamic stop loss and take profit levels based on ATR"""
-        if idx < 1:
-            return None, None
-
-        current_price = df['Close'].iloc[idx]
-        current_atr = df['ATR'].iloc[idx]
-
-        stop_distance = current_atr * multiplier
-        take_profit_distance = current_atr * multiplier * 2  # 1:2 risk-reward ratio
-
-        return stop_distance, take_profit_distance
-
-    def is_volatility_breakout(self, df: pd.DataFrame, idx: int, threshold: float = 1.5) -> bool:
-        """Check if current volatility is significantly above average"""
-        if idx < self.params.volatility_lookback:
-            return False
-
-        current_vol = df['Historical_Volatility'].iloc[idx]
-        avg_vol = df['Historical_Volatility'].iloc[idx -
-                                                   self.params.volatility_lookback:idx].mean()
-
-        return current_vol > (avg_vol * threshold)
-
-    def get_volatility_adjusted_position_size(self, df: pd.DataFrame, idx: int,
-                                              base_position: float = 1.0) -> float:
-        """Calculate position size inversely proportional to volatility"""
-        if idx < self.params.volatility_lookback:
-            return base_position
-
-        current_vol = df['Historical_Volatility'].iloc[idx]
-        avg_vol = df['Historical_Volatility'].iloc[idx -
-                                                   self.params.volatility_lookback:idx].mean()
-
-        vol_ratio = avg_vol / current_vol
-        adjusted_position = base_position * \
-            min(max(vol_ratio, 0.5), 2.0)  # Limit adjustment range
-
-        return adjusted_position
+    @staticmethod
+    def calculate_trend_strength(close: np.ndarray, window: int = 50) -> np.ndarray:
+        """
+        Calculate get_trend_strength for every bar at once
+        Bars without a full window are 0
+        """
+        close = np.ascontiguousarray(close, dtype=np.float64)
+        if NUMBA_AVAILABLE:
+            return _trend_strength_kernel(close, window)
+
+        out = np.zeros(len(close))
+        n = window + 1
+        if len(close) < n:
+            return out
+
+        x = np.arange(n)
+        sx = x.sum()
+        denom = n * (x * x).sum() - sx * sx
+        windows = np.lib.stride_tricks.sliding_window_view(close, n)
+        slope = (n * (windows @ x) - sx * windows.sum(axis=1)) / denom
+        out[window:] = np.tanh(slope * 100)
+        return out
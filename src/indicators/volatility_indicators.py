@@ -1,8 +1,18 @@
 import numpy as np
 import pandas as pd
-import talib as ta
 from dataclasses import dataclass
-from typing import Tuple, Optional
+from typing import Dict, Tuple, Optional
+from ..utils.jit import njit, NUMBA_AVAILABLE
+
+try:
+    import talib as ta
+except ImportError:  # ATR falls back to VolatilityIndicators.calculate_atr
+    ta = None
+
+try:
+    import bottleneck as bn
+except ImportError:  # Rolling statistics fall back to pandas
+    bn = None
 
 
 @dataclass
@@ -14,63 +24,262 @@ class VolatilityParams:
     minimum_atr_value: float = 0.001  # Minimum ATR value to prevent division by zero
 
 
+# ATR multiple for stop distances before the regime adjustment; the
+# Stop_Distance and Take_Profit_Distance columns use this multiplier
+BASE_STOP_MULTIPLIER = 2.0
+
+# Stop distance multipliers per volatility regime
+REGIME_STOP_MULTIPLIERS = {
+    0: 1.5,  # Tighter stops in low volatility
+    1: 1.0,  # Normal volatility
+    2: 0.75  # Tighter stops in high volatility
+}
+
+# Position size adjustments per volatility regime
+REGIME_SIZE_ADJUSTMENTS = {
+    0: 1.2,  # Increase size in low volatility
+    1: 1.0,  # Normal volatility
+    2: 0.8   # Reduce size in high volatility
+}
+
+
+def _rolling_mean(values: pd.Series, window: int,
+                  min_periods: Optional[int] = None) -> pd.Series:
+    """Rolling mean, matching Series.rolling(window, min_periods).mean()"""
+    min_periods = window if min_periods is None else min_periods
+    if bn is None:
+        return values.rolling(window=window, min_periods=min_periods).mean()
+    return pd.Series(
+        bn.move_mean(values.to_numpy(dtype=np.float64), window=window,
+                     min_count=min_periods),
+        index=values.index)
+
+
+def _rolling_std(values: pd.Series, window: int) -> pd.Series:
+    """Rolling sample std, matching Series.rolling(window).std()"""
+    if bn is None:
+        return values.rolling(window=window).std()
+    return pd.Series(
+        bn.move_std(values.to_numpy(dtype=np.float64), window=window,
+                    min_count=window, ddof=1),
+        index=values.index)
+
+
+@njit(cache=True)
+def _atr_bands_kernel(atr: np.ndarray, window: int, num_std: float):
+    """
+    Rolling mean, sample std and mean +/- num_std * std bands in one pass
+    Uses running Welford updates; windows with missing values are NaN,
+    as with Series.rolling(window)
+    """
+    n = atr.shape[0]
+    mean_out = np.full(n, np.nan)
+    std_out = np.full(n, np.nan)
+    upper = np.full(n, np.nan)
+    lower = np.full(n, np.nan)
+
+    count = 0
+    mean = 0.0
+    m2 = 0.0
+    for idx in range(n):
+        x = atr[idx]
+        if not np.isnan(x):
+            count += 1
+            delta = x - mean
+            mean += delta / count
+            m2 += delta * (x - mean)
+
+        if idx >= window:
+            y = atr[idx - window]
+            if not np.isnan(y):
+                count -= 1
+                if count == 0:
+                    mean = 0.0
+                    m2 = 0.0
+                else:
+                    delta = y - mean
+                    mean -= delta / count
+                    m2 -= delta * (y - mean)
+
+        if count == window:
+            mean_out[idx] = mean
+            if window > 1:
+                std = np.sqrt(max(m2, 0.0) / (window - 1))
+                std_out[idx] = std
+                upper[idx] = mean + std * num_std
+                lower[idx] = mean - std * num_std
+
+    return mean_out, std_out, upper, lower
+
+
 class VolatilityIndicators:
     def __init__(self, params: VolatilityParams = VolatilityParams()):
         self.params = params
 
     def calculate_all(self, df: pd.DataFrame) -> pd.DataFrame:
         """Calculate all volatility indicators"""
-        df = df.copy()
+        return df.assign(**self.calculate_columns(df))
+
+    def add_indicators(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Add all volatility indicators to df in place, without the full
+        copy calculate_all makes
+        Returns: df
+        """
+        for name, values in self.calculate_columns(df).items():
+            df[name] = values
+        return df
+
+    def calculate_columns(self, df: pd.DataFrame) -> Dict[str, np.ndarray]:
+        """
+        Calculate all volatility indicators without copying df
+        Returns: dict of indicator arrays keyed by column name
+        """
+        close = df['Close']
 
         # Average True Range (ATR)
-        df['ATR'] = ta.ATR(
-            df['High'],
-            df['Low'],
-            df['Close'],
-            timeperiod=self.params.atr_period
+        ohlc = (
+            df['High'].to_numpy(dtype=np.float64),
+            df['Low'].to_numpy(dtype=np.float64),
+            close.to_numpy(dtype=np.float64)
         )
+        if ta is None:
+            atr_values = self.calculate_atr(*ohlc, self.params.atr_period)
+        else:
+            atr_values = ta.ATR(*ohlc, timeperiod=self.params.atr_period)
+        atr = pd.Series(atr_values, index=df.index)
 
         # Normalize ATR by price
-        df['ATR_Pct'] = (df['ATR'] / df['Close']) * 100
+        atr_pct = (atr / close) * 100
 
         # Historical volatility (standard deviation of returns)
-        returns = df['Close'].pct_change()
-        df['Historical_Volatility'] = returns.rolling(
-            window=self.params.volatility_lookback
-        ).std() * np.sqrt(252)  # Annualize volatility
+        returns = close.pct_change()
+        historical_volatility = _rolling_std(
+            returns, self.params.volatility_lookback
+        ) * np.sqrt(252)  # Annualize volatility
+
+        # Averages over the previous volatility_lookback bars (excluding
+        # the current one), shared by the position sizing and breakout checks
+        hv_avg = _rolling_mean(
+            historical_volatility, self.params.volatility_lookback, min_periods=1
+        ).shift(1)
+        atr_avg = _rolling_mean(
+            atr, self.params.volatility_lookback, min_periods=1
+        ).shift(1)
+
+        # Price trend baseline for get_trend_volatility_signal
+        close_sma = _rolling_mean(close, self.params.volatility_lookback)
 
         # Bollinger Bands based on ATR
-        df['ATR_MA'] = df['ATR'].rolling(
-            window=self.params.std_dev_period).mean()
-        df['ATR_Std'] = df['ATR'].rolling(
-            window=self.params.std_dev_period).std()
-        df['ATR_Upper'] = df['ATR_MA'] + \
-            (df['ATR_Std'] * self.params.bollinger_bands_std)
-        df['ATR_Lower'] = df['ATR_MA'] - \
-            (df['ATR_Std'] * self.params.bollinger_bands_std)
-
-        # Volatility regime (0: low, 1: normal, 2: high)
-        df['Volatility_Regime'] = self._calculate_volatility_regime(df)
+        if NUMBA_AVAILABLE:
+            atr_ma, atr_std, atr_upper, atr_lower = (
+                pd.Series(values, index=df.index)
+                for values in _atr_bands_kernel(
+                    atr.to_numpy(), self.params.std_dev_period,
+                    float(self.params.bollinger_bands_std)))
+        else:
+            atr_ma = _rolling_mean(atr, self.params.std_dev_period)
+            atr_std = _rolling_std(atr, self.params.std_dev_period)
+            atr_upper = atr_ma + (atr_std * self.params.bollinger_bands_std)
+            atr_lower = atr_ma - (atr_std * self.params.bollinger_bands_std)
+
+        regime = self._calculate_volatility_regime(atr)
+        stop_distance, take_profit_distance = self._dynamic_stop_distances(
+            atr.to_numpy(), regime.to_numpy(), BASE_STOP_MULTIPLIER)
+
+        columns = {
+            'ATR': atr,
+            'ATR_Pct': atr_pct,
+            'Historical_Volatility': historical_volatility,
+            'HV_Avg': hv_avg,
+            'ATR_Avg': atr_avg,
+            'Close_SMA': close_sma,
+            'ATR_MA': atr_ma,
+            'ATR_Std': atr_std,
+            'ATR_Upper': atr_upper,
+            'ATR_Lower': atr_lower,
+            # Volatility regime (0: low, 1: normal, 2: high)
+            'Volatility_Regime': regime,
+            # Rate of change of ATR
+            'ATR_ROC': atr.pct_change(periods=5) * 100
+        }
 
-        # Rate of change of ATR
-        df['ATR_ROC'] = df['ATR'].pct_change(periods=5) * 100
+        columns = {name: values.to_numpy() for name, values in columns.items()}
+        # get_dynamic_stops distances at BASE_STOP_MULTIPLIER
+        columns['Stop_Distance'] = stop_distance
+        columns['Take_Profit_Distance'] = take_profit_distance
+        return columns
 
-        return df
-
-    def _calculate_volatility_regime(self, df: pd.DataFrame) -> pd.Series:
+    @staticmethod
+    def calculate_atr(high: np.ndarray, low: np.ndarray, close: np.ndarray,
+                      period: int = 14) -> np.ndarray:
+        """
+        Wilder ATR in one vectorized pass, seeded like ta.ATR with the mean
+        true range of the first period bars; earlier bars are NaN
+        """
+        atr = np.full(len(close), np.nan)
+        if len(close) <= period:
+            return atr
+
+        prev_close = np.roll(close, 1)
+        true_range = np.maximum.reduce([
+            high - low, np.fabs(high - prev_close), np.fabs(low - prev_close)
+        ])[1:]
+
+        # Wilder smoothing is an EMA with alpha = 1 / period
+        smoothed = true_range[period - 1:].copy()
+        smoothed[0] = true_range[:period].mean()
+        atr[period:] = pd.Series(smoothed).ewm(
+            alpha=1 / period, adjust=False).mean().to_numpy()
+        return atr
+
+    @staticmethod
+    def update_atr(prev_atr: float, high: float, low: float,
+                   prev_close: float, period: int = 14) -> float:
+        """Advance a Wilder ATR by one bar, for streaming updates"""
+        true_range = max(high - low, abs(high - prev_close),
+                         abs(low - prev_close))
+        return prev_atr + (true_range - prev_atr) / period
+
+    def _calculate_volatility_regime(self, atr: pd.Series) -> pd.Series:
         """Determine volatility regime based on ATR"""
-        atr_percentile = df['ATR'].rolling(window=100).apply(
-            lambda x: pd.Series(x).rank(pct=True).iloc[-1]
-        )
+        atr_percentile = self._rolling_percentile_rank(atr, 100)
+
+        percentile = atr_percentile.to_numpy()
 
-        regime = pd.Series(index=df.index, data=1)  # Default to normal regime
-        regime[atr_percentile <= 0.25] = 0  # Low volatility
-        regime[atr_percentile >= 0.75] = 2  # High volatility
+        # Normal regime (1), minus one when low volatility and plus one when
+        # high; missing percentiles stay normal
+        regime = (1 - (percentile <= 0.25) + (percentile >= 0.75)).astype(np.int8)
 
-        return regime
+        return pd.Series(regime, index=atr.index)
 
-    def get_dynamic_stops(self, df: pd.DataFrame, idx: int,
-                          base_multiplier: float = 2.0) -> Tuple[float, float]:
+    @staticmethod
+    def _rolling_percentile_rank(values: pd.Series, window: int) -> pd.Series:
+        """
+        Percentile rank of each value within its trailing window, matching
+        rolling(window).apply(lambda x: pd.Series(x).rank(pct=True).iloc[-1])
+        """
+        data = values.to_numpy(dtype=np.float64)
+        ranks = np.full(len(data), np.nan)
+        if len(data) < window:
+            return pd.Series(ranks, index=values.index)
+
+        windows = np.lib.stride_tricks.sliding_window_view(data, window)
+        newest = windows[:, -1:]
+        below = (windows < newest).sum(axis=1)
+        ties = (windows == newest).sum(axis=1)
+
+        # Average rank of ties, as in Series.rank(method='average')
+        ranks[window - 1:] = (below + (ties + 1) / 2) / window
+        # Windows with missing values have no rank
+        incomplete = np.isnan(windows).any(axis=1)
+        ranks[window - 1:][incomplete] = np.nan
+
+        return pd.Series(ranks, index=values.index)
+
+    def get_dynamic_stops(self, cols: Dict[str, np.ndarray], idx: int,
+                          base_multiplier: float = BASE_STOP_MULTIPLIER
+                          ) -> Tuple[float, float]:
         """
         Calculate dynamic stop loss and take profit distances based on ATR
         Adjusts distances based on volatility regime
@@ -80,25 +289,56 @@ class VolatilityIndicators:
         if idx < 1:
             return None, None
 
+        if base_multiplier == BASE_STOP_MULTIPLIER and 'Stop_Distance' in cols:
+            return cols['Stop_Distance'][idx], cols['Take_Profit_Distance'][idx]
+
         # Get current ATR and regime
-        current_atr = max(df['ATR'].iloc[idx], self.params.minimum_atr_value)
-        regime = df['Volatility_Regime'].iloc[idx]
+        current_atr = max(cols['ATR'][idx], self.params.minimum_atr_value)
+        regime = cols['Volatility_Regime'][idx]
 
         # Adjust multiplier based on regime
-        regime_multipliers = {
-            0: 1.5,  # Tighter stops in low volatility
-            1: 1.0,  # Normal volatility
-            2: 0.75  # Tighter stops in high volatility
-        }
+        adjusted_multiplier = base_multiplier * REGIME_STOP_MULTIPLIERS[regime]
+
+        stop_distance = current_atr * adjusted_multiplier
+        take_profit_distance = stop_distance * 2  # 1:2 risk-reward ratio
+
+        return stop_distance, take_profit_distance
+
+    def precompute_dynamic_stops(self, df: pd.DataFrame,
+                                 base_multiplier: float = BASE_STOP_MULTIPLIER
+                                 ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Calculate get_dynamic_stops distances for every bar at once
+        The first bar has no stops and is NaN
+
+        Returns: (stop_distance, take_profit_distance) arrays
+        """
+        if base_multiplier == BASE_STOP_MULTIPLIER and 'Stop_Distance' in df:
+            return (df['Stop_Distance'].to_numpy(),
+                    df['Take_Profit_Distance'].to_numpy())
+
+        return self._dynamic_stop_distances(
+            df['ATR'].to_numpy(), df['Volatility_Regime'].to_numpy(),
+            base_multiplier)
+
+    def _dynamic_stop_distances(self, atr: np.ndarray, regime: np.ndarray,
+                                base_multiplier: float
+                                ) -> Tuple[np.ndarray, np.ndarray]:
+        """Stop and take profit distances from ATR and regime arrays"""
+        current_atr = np.maximum(atr, self.params.minimum_atr_value)
+        regime = regime.astype(np.intp)
 
-        adjusted_multiplier = base_multiplier * regime_multipliers[regime]
+        multipliers = np.array(
+            [REGIME_STOP_MULTIPLIERS[r] for r in sorted(REGIME_STOP_MULTIPLIERS)])
+        adjusted_multiplier = base_multiplier * multipliers[regime]
 
         stop_distance = current_atr * adjusted_multiplier
+        stop_distance[:1] = np.nan
         take_profit_distance = stop_distance * 2  # 1:2 risk-reward ratio
 
         return stop_distance, take_profit_distance
 
-    def get_volatility_adjusted_position_size(self, df: pd.DataFrame, idx: int,
+    def get_volatility_adjusted_position_size(self, cols: Dict[str, np.ndarray], idx: int,
                                               base_position: float = 1.0,
                                               min_size: float = 0.25,
                                               max_size: float = 2.0) -> float:
@@ -109,28 +349,42 @@ class VolatilityIndicators:
         if idx < self.params.volatility_lookback:
             return base_position
 
-        current_vol = df['Historical_Volatility'].iloc[idx]
-        avg_vol = df['Historical_Volatility'].iloc[idx -
-                                                   self.params.volatility_lookback:idx].mean()
+        current_vol = cols['Historical_Volatility'][idx]
+        avg_vol = cols['HV_Avg'][idx]
 
         # Base adjustment based on volatility ratio
         # Prevent division by zero
         vol_ratio = avg_vol / max(current_vol, 0.001)
 
         # Additional adjustment based on regime
-        regime = df['Volatility_Regime'].iloc[idx]
-        regime_adjustments = {
-            0: 1.2,   # Increase size in low volatility
-            1: 1.0,   # Normal volatility
-            2: 0.8    # Reduce size in high volatility
-        }
-
+        regime = cols['Volatility_Regime'][idx]
         adjusted_position = base_position * \
-            vol_ratio * regime_adjustments[regime]
+            vol_ratio * REGIME_SIZE_ADJUSTMENTS[regime]
 
         # Ensure position size stays within bounds
         return max(min(adjusted_position, max_size), min_size)
 
+    def precompute_position_sizes(self, cols: Dict[str, np.ndarray],
+                                  base_position: float = 1.0,
+                                  min_size: float = 0.25,
+                                  max_size: float = 2.0) -> np.ndarray:
+        """
+        Calculate get_volatility_adjusted_position_size for every bar at once
+        Returns: position size array
+        """
+        current_vol = cols['Historical_Volatility']
+        avg_vol = cols['HV_Avg']
+        vol_ratio = avg_vol / np.maximum(current_vol, 0.001)
+
+        regime = cols['Volatility_Regime'].astype(np.intp)
+        adjustments = np.array(
+            [REGIME_SIZE_ADJUSTMENTS[r] for r in sorted(REGIME_SIZE_ADJUSTMENTS)])
+        adjusted_position = base_position * vol_ratio * adjustments[regime]
+
+        sizes = np.clip(adjusted_position, min_size, max_size)
+        sizes[:self.params.volatility_lookback] = base_position
+        return sizes
+
     def is_volatility_breakout(self, df: pd.DataFrame, idx: int,
                                lookback: int = 20,
                                threshold: float = 1.5) -> bool:
@@ -141,8 +395,11 @@ class VolatilityIndicators:
         if idx < lookback:
             return False
 
-        current_atr = df['ATR'].iloc[idx]
-        avg_atr = df['ATR'].iloc[idx-lookback:idx].mean()
+        current_atr = df['ATR'].iat[idx]
+        if lookback == self.params.volatility_lookback:
+            avg_atr = df['ATR_Avg'].iat[idx]
+        else:
+            avg_atr = df['ATR'].iloc[idx-lookback:idx].mean()
 
         return current_atr > (avg_atr * threshold)
 
@@ -156,18 +413,21 @@ class VolatilityIndicators:
             return None
 
         # Calculate price trend
-        price_sma = df['Close'].rolling(window=trend_window).mean()
-        trend_direction = 1 if df['Close'].iloc[idx] > price_sma.iloc[idx] else -1
+        if trend_window == self.params.volatility_lookback:
+            price_sma = df['Close_SMA'].iat[idx]
+        else:
+            price_sma = df['Close'].iloc[idx-trend_window+1:idx+1].mean()
+        trend_direction = 1 if df['Close'].iat[idx] > price_sma else -1
 
         # Check if volatility is favorable for trading
-        regime = df['Volatility_Regime'].iloc[idx]
+        regime = df['Volatility_Regime'].iat[idx]
         vol_breakout = self.is_volatility_breakout(df, idx)
 
         # Generate signal based on conditions
         if regime != 2 and not vol_breakout:  # Avoid extreme volatility
-            if trend_direction == 1 and df['ATR_ROC'].iloc[idx] > 0:
+            if trend_direction == 1 and df['ATR_ROC'].iat[idx] > 0:
                 return 'long'
-            elif trend_direction == -1 and df['ATR_ROC'].iloc[idx] > 0:
+            elif trend_direction == -1 and df['ATR_ROC'].iat[idx] > 0:
                 return 'short'
 
         return None
@@ -178,10 +438,10 @@ class VolatilityIndicators:
             return {}
 
         return {
-            'current_atr': df['ATR'].iloc[idx],
-            'atr_percentile': df['ATR'].iloc[idx-100:idx].rank(pct=True).iloc[-1],
-            'volatility_regime': df['Volatility_Regime'].iloc[idx],
-            'historical_volatility': df['Historical_Volatility'].iloc[idx],
-            'atr_trend': 'Increasing' if df['ATR_ROC'].iloc[idx] > 0 else 'Decreasing',
+            'current_atr': df['ATR'].iat[idx],
+            'atr_percentile': df['ATR'].iloc[idx-100:idx].rank(pct=True).iat[-1],
+            'volatility_regime': df['Volatility_Regime'].iat[idx],
+            'historical_volatility': df['Historical_Volatility'].iat[idx],
+            'atr_trend': 'Increasing' if df['ATR_ROC'].iat[idx] > 0 else 'Decreasing',
             'is_breakout': self.is_volatility_breakout(df, idx)
         }
@@ -1,10 +1,10 @@
 import numpy as np
 import pandas as pd
-from typing import Tuple
+from typing import Dict, Tuple
 
 class CandlestickPatterns:
     @staticmethod
-    def is_engulfing(df: pd.DataFrame, idx: int) -> Tuple[bool, bool]:
+    def is_engulfing(cols: Dict[str, np.ndarray], idx: int) -> Tuple[bool, bool]:
         """
         Check for bullish and bearish engulfing patterns
         Returns: (is_bullish_engulfing, is_bearish_engulfing)
@@ -12,8 +12,8 @@ class CandlestickPatterns:
         if idx < 1:
             return False, False
             
-        curr_open, curr_close = df['Open'].iloc[idx], df['Close'].iloc[idx]
-        prev_open, prev_close = df['Open'].iloc[idx-1], df['Close'].iloc[idx-1]
+        curr_open, curr_close = cols['Open'][idx], cols['Close'][idx]
+        prev_open, prev_close = cols['Open'][idx-1], cols['Close'][idx-1]
         
         bullish_engulfing = (
             prev_close < prev_open and  # Previous red candle
@@ -32,44 +32,44 @@ class CandlestickPatterns:
         return bullish_engulfing, bearish_engulfing
     
     @staticmethod
-    def is_doji(df: pd.DataFrame, idx: int, threshold: float = 0.1) -> bool:
+    def is_doji(cols: Dict[str, np.ndarray], idx: int, threshold: float = 0.1) -> bool:
         """Check for doji pattern"""
         if idx < 0:
             return False
             
-        body_size = abs(df['Close'].iloc[idx] - df['Open'].iloc[idx])
-        high_low_range = df['High'].iloc[idx] - df['Low'].iloc[idx]
+        body_size = abs(cols['Close'][idx] - cols['Open'][idx])
+        high_low_range = cols['High'][idx] - cols['Low'][idx]
         
         return body_size <= (high_low_range * threshold)
     
     @staticmethod
-    def is_hammer(df: pd.DataFrame, idx: int) -> bool:
+    def is_hammer(cols: Dict[str, np.ndarray], idx: int) -> bool:
         """Check for hammer pattern"""
         if idx < 0:
             return False
             
-        body_size = abs(df['Close'].iloc[idx] - df['Open'].iloc[idx])
-        lower_wick = min(df['Open'].iloc[idx], df['Close'].iloc[idx]) - df['Low'].iloc[idx]
-        upper_wick = df['High'].iloc[idx] - max(df['Open'].iloc[idx], df['Close'].iloc[idx])
+        body_size = abs(cols['Close'][idx] - cols['Open'][idx])
+        lower_wick = min(cols['Open'][idx], cols['Close'][idx]) - cols['Low'][idx]
+        upper_wick = cols['High'][idx] - max(cols['Open'][idx], cols['Close'][idx])
         
         return (lower_wick > (2 * body_size) and  # Long lower wick
                 upper_wick < (0.1 * body_size))    # Very small upper wick
     
     @staticmethod
-    def is_shooting_star(df: pd.DataFrame, idx: int) -> bool:
+    def is_shooting_star(cols: Dict[str, np.ndarray], idx: int) -> bool:
         """Check for shooting star pattern"""
         if idx < 0:
             return False
             
-        body_size = abs(df['Close'].iloc[idx] - df['Open'].iloc[idx])
-        lower_wick = min(df['Open'].iloc[idx], df['Close'].iloc[idx]) - df['Low'].iloc[idx]
-        upper_wick = df['High'].iloc[idx] - max(df['Open'].iloc[idx], df['Close'].iloc[idx])
+        body_size = abs(cols['Close'][idx] - cols['Open'][idx])
+        lower_wick = min(cols['Open'][idx], cols['Close'][idx]) - cols['Low'][idx]
+        upper_wick = cols['High'][idx] - max(cols['Open'][idx], cols['Close'][idx])
         
         return (upper_wick > (2 * body_size) and  # Long upper wick
                 lower_wick < (0.1 * body_size))    # Very small lower wick
     
     @staticmethod
-    def is_marubozu(df: pd.DataFrame, idx: int, threshold: float = 0.1) -> Tuple[bool, bool]:
+    def is_marubozu(cols: Dict[str, np.ndarray], idx: int, threshold: float = 0.1) -> Tuple[bool, bool]:
         """
         Check for marubozu (strong trend candle with little to no wicks)
         Returns: (is_bullish_marubozu, is_bearish_marubozu)
@@ -77,10 +77,10 @@ class CandlestickPatterns:
         if idx < 0:
             return False, False
             
-        open_price = df['Open'].iloc[idx]
-        close_price = df['Close'].iloc[idx]
-        high_price = df['High'].iloc[idx]
-        low_price = df['Low'].iloc[idx]
+        open_price = cols['Open'][idx]
+        close_price = cols['Close'][idx]
+        high_price = cols['High'][idx]
+        low_price = cols['Low'][idx]
         
         body_size = abs(close_price - open_price)
         total_range = high_price - low_price
@@ -101,3 +101,61 @@ class CandlestickPatterns:
         )
         
         return bullish_marubozu, bearish_marubozu
+
+    @staticmethod
+    def precompute_patterns(cols: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        """
+        Evaluate every pattern check on every bar in one vectorized pass
+        Returns: dict of per-bar boolean pattern arrays
+        """
+        open_price = cols['Open']
+        close_price = cols['Close']
+        high_price = cols['High']
+        low_price = cols['Low']
+
+        # Candle anatomy, computed in place to avoid temporaries
+        body_size = np.subtract(close_price, open_price)
+        np.fabs(body_size, out=body_size)
+        high_low_range = np.subtract(high_price, low_price)
+        lower_wick = np.minimum(open_price, close_price)
+        np.subtract(lower_wick, low_price, out=lower_wick)
+        upper_wick = np.maximum(open_price, close_price)
+        np.subtract(high_price, upper_wick, out=upper_wick)
+        is_green = close_price > open_price
+        is_red = close_price < open_price
+
+        # Engulfing compares each bar with the previous one
+        prev_open = np.roll(open_price, 1)
+        prev_close = np.roll(close_price, 1)
+        bullish_engulfing = (
+            (prev_close < prev_open) & is_green &
+            (open_price < prev_close) & (close_price > prev_open)
+        )
+        bearish_engulfing = (
+            (prev_close > prev_open) & is_red &
+            (open_price > prev_close) & (close_price < prev_open)
+        )
+        bullish_engulfing[:1] = False
+        bearish_engulfing[:1] = False
+
+        # Marubozu body should be at least 90% of total range
+        marubozu_body = ~(body_size < (high_low_range * 0.9))
+        wick_limit = 0.1 * body_size
+
+        return {
+            'bullish_engulfing': bullish_engulfing,
+            'bearish_engulfing': bearish_engulfing,
+            'doji': body_size <= (high_low_range * 0.1),
+            'hammer': (lower_wick > (2 * body_size)) & (upper_wick < (0.1 * body_size)),
+            'shooting_star': (upper_wick > (2 * body_size)) & (lower_wick < (0.1 * body_size)),
+            'bullish_marubozu': (
+                marubozu_body & is_green &
+                ((high_price - close_price) <= wick_limit) &
+                ((open_price - low_price) <= wick_limit)
+            ),
+            'bearish_marubozu': (
+                marubozu_body & is_red &
+                ((high_price - open_price) <= wick_limit) &
+                ((close_price - low_price) <= wick_limit)
+            )
+        }
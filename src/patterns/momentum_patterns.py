@@ -1,11 +1,62 @@
 import numpy as np
 import pandas as pd
-from typing import Tuple
+from typing import Dict, Tuple
+from ..utils.jit import njit, NUMBA_AVAILABLE
+
+
+@njit(cache=True)
+def _momentum_patterns_kernel(open_price: np.ndarray, high: np.ndarray,
+                              low: np.ndarray, close: np.ndarray,
+                              volume: np.ndarray, lookback: int):
+    """
+    Breakout and volume confirmation for every bar
+    Same tests as is_breakout_candle and is_momentum_confirmed with their
+    default arguments
+    """
+    n = close.shape[0]
+    bullish_breakout = np.zeros(n, np.bool_)
+    bearish_breakout = np.zeros(n, np.bool_)
+    momentum_confirmed = np.zeros(n, np.bool_)
+
+    for idx in range(n):
+        if idx >= lookback:
+            size_sum = 0.0
+            price_sum = 0.0
+            lookback_high = high[idx - lookback]
+            lookback_low = low[idx - lookback]
+            for j in range(idx - lookback, idx):
+                size_sum += abs(close[j] - open_price[j])
+                price_sum += close[j]
+                lookback_high = max(lookback_high, high[j])
+                lookback_low = min(lookback_low, low[j])
+
+            current_size = abs(close[idx] - open_price[idx])
+            is_large_candle = current_size > 2 * (size_sum / lookback)
+            is_consolidation = (lookback_high - lookback_low) < (
+                0.2 * (price_sum / lookback))
+            if is_large_candle and is_consolidation:
+                bullish_breakout[idx] = (close[idx] > open_price[idx] and
+                                         close[idx] > lookback_high)
+                bearish_breakout[idx] = (close[idx] < open_price[idx] and
+                                         close[idx] < lookback_low)
+
+        if idx >= 20:
+            volume_sum = 0.0
+            for j in range(idx - 20, idx):
+                volume_sum += volume[j]
+            momentum_confirmed[idx] = volume[idx] > 1.5 * (volume_sum / 20)
+
+    return bullish_breakout, bearish_breakout, momentum_confirmed
+
+
+def _trailing_windows(values: np.ndarray, window: int) -> np.ndarray:
+    """Views of the window bars before each bar from index window onward"""
+    return np.lib.stride_tricks.sliding_window_view(values, window)[:-1]
 
 
 class MomentumPatterns:
     @staticmethod
-    def is_breakout_candle(df: pd.DataFrame, idx: int, lookback: int = 20) -> Tuple[bool, bool]:
+    def is_breakout_candle(cols: Dict[str, np.ndarray], idx: int, lookback: int = 20) -> Tuple[bool, bool]:
         """
         Identify breakout candles from consolidation
         Returns: (is_bullish_breakout, is_bearish_breakout)
@@ -15,20 +66,20 @@ class MomentumPatterns:
 
         # Calculate average candle size over lookback period
         candle_sizes = abs(
-            df['Close'].iloc[idx-lookback:idx] - df['Open'].iloc[idx-lookback:idx])
+            cols['Close'][idx-lookback:idx] - cols['Open'][idx-lookback:idx])
         avg_size = candle_sizes.mean()
 
-        current_size = abs(df['Close'].iloc[idx] - df['Open'].iloc[idx])
+        current_size = abs(cols['Close'][idx] - cols['Open'][idx])
         is_large_candle = current_size > (
             2 * avg_size)  # Candle is 2x average size
 
         # Calculate price range during lookback period
-        lookback_high = df['High'].iloc[idx-lookback:idx].max()
-        lookback_low = df['Low'].iloc[idx-lookback:idx].min()
+        lookback_high = cols['High'][idx-lookback:idx].max()
+        lookback_low = cols['Low'][idx-lookback:idx].min()
         consolidation_range = lookback_high - lookback_low
 
         # Check if price was in consolidation (range < 20% of price)
-        avg_price = df['Close'].iloc[idx-lookback:idx].mean()
+        avg_price = cols['Close'][idx-lookback:idx].mean()
         is_consolidation = consolidation_range < (0.2 * avg_price)
 
         if not (is_large_candle and is_consolidation):
@@ -36,34 +87,34 @@ class MomentumPatterns:
 
         # Determine breakout direction
         bullish_breakout = (
-            df['Close'].iloc[idx] > df['Open'].iloc[idx] and  # Green candle
+            cols['Close'][idx] > cols['Open'][idx] and  # Green candle
             # Closes above consolidation
-            df['Close'].iloc[idx] > lookback_high
+            cols['Close'][idx] > lookback_high
         )
 
         bearish_breakout = (
-            df['Close'].iloc[idx] < df['Open'].iloc[idx] and  # Red candle
+            cols['Close'][idx] < cols['Open'][idx] and  # Red candle
             # Closes below consolidation
-            df['Close'].iloc[idx] < lookback_low
+            cols['Close'][idx] < lookback_low
         )
 
         return bullish_breakout, bearish_breakout
 
     @staticmethod
-    def is_momentum_confirmed(df: pd.DataFrame, idx: int, volume_threshold: float = 1.5) -> bool:
+    def is_momentum_confirmed(cols: Dict[str, np.ndarray], idx: int, volume_threshold: float = 1.5) -> bool:
         """Check if momentum is confirmed by volume"""
         if idx < 20:  # Need some history for volume average
             return False
 
         # Calculate average volume
-        avg_volume = df['Volume'].iloc[idx-20:idx].mean()
-        current_volume = df['Volume'].iloc[idx]
+        avg_volume = cols['Volume'][idx-20:idx].mean()
+        current_volume = cols['Volume'][idx]
 
         # Volume should be above threshold
         return current_volume > (volume_threshold * avg_volume)
 
     @staticmethod
-    def calculate_momentum_score(df: pd.DataFrame, idx: int) -> float:
+    def calculate_momentum_score(cols: Dict[str, np.ndarray], idx: int) -> float:
         """
         Calculate a momentum score (-1 to 1) based on recent price action
         Positive score indicates bullish momentum, negative indicates bearish
@@ -73,14 +124,102 @@ class MomentumPatterns:
 
         # Calculate short-term momentum (last 5 candles)
         short_term_return = (
-            df['Close'].iloc[idx] - df['Close'].iloc[idx-5]) / df['Close'].iloc[idx-5]
+            cols['Close'][idx] - cols['Close'][idx-5]) / cols['Close'][idx-5]
 
         # Calculate medium-term momentum (last 20 candles)
         medium_term_return = (
-            df['Close'].iloc[idx] - df['Close'].iloc[idx-20]) / df['Close'].iloc[idx-20]
+            cols['Close'][idx] - cols['Close'][idx-20]) / cols['Close'][idx-20]
 
         # Combine both timeframes with more weight on short-term
         momentum_score = (0.7 * short_term_return + 0.3 * medium_term_return)
 
         # Normalize to -1 to 1 range
         return max(min(momentum_score, 1.0), -1.0)
+
+    @classmethod
+    def precompute_patterns(cls, cols: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        """
+        Evaluate the breakout, confirmation and score checks on every bar
+        Returns: dict of per-bar pattern arrays
+        """
+        momentum_score = cls.calculate_momentum_scores(cols['Close'])
+
+        if NUMBA_AVAILABLE:
+            bullish, bearish, confirmed = _momentum_patterns_kernel(
+                *(np.ascontiguousarray(cols[c], dtype=np.float64)
+                  for c in ('Open', 'High', 'Low', 'Close', 'Volume')),
+                20)
+            return {
+                'bullish_breakout': bullish,
+                'bearish_breakout': bearish,
+                'momentum_confirmed': confirmed,
+                'momentum_score': momentum_score
+            }
+
+        # Without Numba, breakouts and volume confirmation come from
+        # trailing window stats
+        close = cols['Close']
+        open_price = cols['Open']
+        levels = cls.precompute_lookback_levels(cols, 20)
+
+        body_size = np.fabs(close - open_price)
+        is_large_candle = body_size > (2 * levels['LB_AvgBody'])
+        is_consolidation = (
+            levels['LB_High'] - levels['LB_Low']) < (0.2 * levels['LB_AvgPrice'])
+        is_setup = is_large_candle & is_consolidation
+
+        avg_volume = np.full(len(close), np.nan)
+        if len(close) > 20:
+            avg_volume[20:] = _trailing_windows(cols['Volume'], 20).mean(axis=1)
+
+        return {
+            'bullish_breakout': is_setup & (close > open_price) & (close > levels['LB_High']),
+            'bearish_breakout': is_setup & (close < open_price) & (close < levels['LB_Low']),
+            'momentum_confirmed': cols['Volume'] > (1.5 * avg_volume),
+            'momentum_score': momentum_score
+        }
+
+    @staticmethod
+    def calculate_momentum_scores(close: np.ndarray) -> np.ndarray:
+        """
+        Calculate calculate_momentum_score for every bar at once
+        Bars with fewer than 20 bars of history are 0
+        """
+        scores = np.zeros(len(close))
+        if len(close) <= 20:
+            return scores
+
+        current = close[20:]
+        short_term_return = (current - close[15:-5]) / close[15:-5]
+        medium_term_return = (current - close[:-20]) / close[:-20]
+        momentum_score = 0.7 * short_term_return + 0.3 * medium_term_return
+
+        # Normalize to -1 to 1 range
+        scores[20:] = np.clip(momentum_score, -1.0, 1.0)
+        return scores
+
+    @staticmethod
+    def precompute_lookback_levels(cols: Dict[str, np.ndarray],
+                                   lookback: int = 20) -> Dict[str, np.ndarray]:
+        """
+        Trailing stats is_breakout_candle takes over the lookback bars
+        before each bar; bars without a full lookback are NaN
+        Returns: dict of LB_High, LB_Low, LB_AvgBody and LB_AvgPrice arrays
+        """
+        n = len(cols['Close'])
+        levels = {name: np.full(n, np.nan)
+                  for name in ('LB_High', 'LB_Low', 'LB_AvgBody', 'LB_AvgPrice')}
+        if n <= lookback:
+            return levels
+
+        body_size = np.fabs(cols['Close'] - cols['Open'])
+        levels['LB_High'][lookback:] = _trailing_windows(
+            cols['High'], lookback).max(axis=1)
+        levels['LB_Low'][lookback:] = _trailing_windows(
+            cols['Low'], lookback).min(axis=1)
+        levels['LB_AvgBody'][lookback:] = _trailing_windows(
+            body_size, lookback).mean(axis=1)
+        levels['LB_AvgPrice'][lookback:] = _trailing_windows(
+            cols['Close'], lookback).mean(axis=1)
+
+        return levels
@@ -1,5 +1,5 @@
-from typing import Tuple, Dict
-import pandas as pd
+from typing import Tuple, Dict, Optional
+import numpy as np
 from ..patterns.candlestick_patterns import CandlestickPatterns
 from ..patterns.momentum_patterns import MomentumPatterns
 from ..indicators.momentum_indicators import MomentumIndicators
@@ -17,27 +17,42 @@ class EntryRules:
         self.momentum_indicators = momentum_indicators
         self.volatility_indicators = volatility_indicators
 
-    def check_entry_signals(self, df: pd.DataFrame, idx: int) -> Tuple[bool, bool, Dict]:
+    def check_entry_signals(self, cols: Dict[str, np.ndarray], idx: int,
+                            signals: Optional[Dict[str, np.ndarray]] = None,
+                            full_details: bool = False
+                            ) -> Tuple[bool, bool, Dict]:
         """
         Check all entry conditions
+        signals: optional output of MomentumIndicators.precompute_signals
+        full_details: build signal_details even for bars that cannot enter
         Returns: (bullish_entry, bearish_entry, signal_details)
         """
         if idx < 20:  # Need sufficient history
             return False, False, {}
 
+        # Both directions need volume confirmation and a strong trend, so
+        # check those cheap gates before any pattern
+        momentum_confirmed = self.momentum_patterns.is_momentum_confirmed(
+            cols, idx)
+        trend_strength = cols['Trend_Strength'][idx]
+        if not full_details and not (
+                momentum_confirmed and
+                (trend_strength > 0.3 or trend_strength < -0.3)):
+            return False, False, {}
+
         signal_details = {}
 
         # Check candlestick patterns
         bull_engulf, bear_engulf = self.candlestick_patterns.is_engulfing(
-            df, idx)
+            cols, idx)
         signal_details['engulfing'] = {
             'bullish': bull_engulf, 'bearish': bear_engulf}
 
-        is_doji = self.candlestick_patterns.is_doji(df, idx)
-        is_hammer = self.candlestick_patterns.is_hammer(df, idx)
-        is_shooting_star = self.candlestick_patterns.is_shooting_star(df, idx)
+        is_doji = self.candlestick_patterns.is_doji(cols, idx)
+        is_hammer = self.candlestick_patterns.is_hammer(cols, idx)
+        is_shooting_star = self.candlestick_patterns.is_shooting_star(cols, idx)
         bull_marubozu, bear_marubozu = self.candlestick_patterns.is_marubozu(
-            df, idx)
+            cols, idx)
 
         signal_details['candlestick'] = {
             'doji': is_doji,
@@ -48,11 +63,9 @@ class EntryRules:
 
         # Check momentum patterns
         bull_breakout, bear_breakout = self.momentum_patterns.is_breakout_candle(
-            df, idx)
-        momentum_confirmed = self.momentum_patterns.is_momentum_confirmed(
-            df, idx)
+            cols, idx)
         momentum_score = self.momentum_patterns.calculate_momentum_score(
-            df, idx)
+            cols, idx)
 
         signal_details['momentum'] = {
             'breakout': {'bullish': bull_breakout, 'bearish': bear_breakout},
@@ -61,9 +74,12 @@ class EntryRules:
         }
 
         # Get indicator signals
-        indicator_signals = self.momentum_indicators.get_momentum_signals(
-            df, idx)
-        trend_strength = self.momentum_indicators.get_trend_strength(df, idx)
+        if signals is None:
+            indicator_signals = self.momentum_indicators.get_momentum_signals(
+                cols, idx)
+        else:
+            indicator_signals = {
+                name: values[idx] for name, values in signals.items()}
 
         signal_details['indicators'] = {
             **indicator_signals,
@@ -89,15 +105,66 @@ class EntryRules:
 
         return bullish_entry, bearish_entry, signal_details
 
-    def calculate_position_size(self, df: pd.DataFrame, idx: int,
+    def precompute_entry_signals(self, cols: Dict[str, np.ndarray],
+                                 signals: Dict[str, np.ndarray],
+                                 patterns: Dict[str, np.ndarray]
+                                 ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Evaluate the check_entry_signals decision for every bar at once
+        signals: output of MomentumIndicators.precompute_signals
+        patterns: merged precompute_patterns output of both pattern classes
+        Returns: (bullish_entry, bearish_entry) boolean arrays
+        """
+        momentum_score = patterns['momentum_score']
+        trend_strength = cols['Trend_Strength']
+
+        bullish_entry = (
+            (patterns['bullish_engulfing'] |
+             (patterns['doji'] & (momentum_score > 0)) |
+             patterns['hammer'] | patterns['bullish_marubozu'] |
+             patterns['bullish_breakout']) &
+            patterns['momentum_confirmed'] &
+            (trend_strength > 0.3) &
+            ~signals['rsi_overbought']
+        )
+
+        bearish_entry = (
+            (patterns['bearish_engulfing'] |
+             (patterns['doji'] & (momentum_score < 0)) |
+             patterns['shooting_star'] | patterns['bearish_marubozu'] |
+             patterns['bearish_breakout']) &
+            patterns['momentum_confirmed'] &
+            (trend_strength < -0.3) &
+            ~signals['rsi_oversold']
+        )
+
+        # Need sufficient history
+        bullish_entry[:20] = False
+        bearish_entry[:20] = False
+
+        return bullish_entry, bearish_entry
+
+    def calculate_position_size(self, cols: Dict[str, np.ndarray], idx: int,
                                 base_position: float = 1.0) -> float:
         """Calculate position size based on volatility and momentum strength"""
         momentum_score = abs(
-            self.momentum_patterns.calculate_momentum_score(df, idx))
+            self.momentum_patterns.calculate_momentum_score(cols, idx))
         momentum_factor = 0.5 + (momentum_score * 0.5)  # Scale 0.5 to 1.0
 
         vol_adjusted_size = self.volatility_indicators.get_volatility_adjusted_position_size(
-            df, idx, base_position
+            cols, idx, base_position
+        )
+
+        return vol_adjusted_size * momentum_factor
+
+    def precompute_position_sizes(self, cols: Dict[str, np.ndarray],
+                                  patterns: Dict[str, np.ndarray],
+                                  base_position: float = 1.0) -> np.ndarray:
+        """Calculate calculate_position_size for every bar at once"""
+        momentum_factor = 0.5 + (np.abs(patterns['momentum_score']) * 0.5)
+
+        vol_adjusted_size = self.volatility_indicators.precompute_position_sizes(
+            cols, base_position
         )
 
         return vol_adjusted_size * momentum_factor
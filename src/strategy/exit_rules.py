@@ -1,4 +1,5 @@
-from typing import Tuple, Dict
+from typing import Tuple, Dict, Optional
+import numpy as np
 import pandas as pd
 from ..patterns.candlestick_patterns import CandlestickPatterns
 from ..patterns.momentum_patterns import MomentumPatterns
@@ -17,11 +18,14 @@ class ExitRules:
         self.momentum_indicators = momentum_indicators
         self.volatility_indicators = volatility_indicators
 
-    def check_exit_signals(self, df: pd.DataFrame, idx: int,
-                           position_type: str) -> Tuple[bool, Dict]:
+    def check_exit_signals(self, cols: Dict[str, np.ndarray], idx: int,
+                           position_type: str,
+                           signals: Optional[Dict[str, np.ndarray]] = None
+                           ) -> Tuple[bool, Dict]:
         """
         Check all exit conditions
         position_type: 'long' or 'short'
+        signals: optional output of MomentumIndicators.precompute_signals
         Returns: (should_exit, exit_details)
         """
         if idx < 1:
@@ -31,9 +35,9 @@ class ExitRules:
 
         # Check reversal patterns
         bull_engulf, bear_engulf = self.candlestick_patterns.is_engulfing(
-            df, idx)
-        is_shooting_star = self.candlestick_patterns.is_shooting_star(df, idx)
-        is_hammer = self.candlestick_patterns.is_hammer(df, idx)
+            cols, idx)
+        is_shooting_star = self.candlestick_patterns.is_shooting_star(cols, idx)
+        is_hammer = self.candlestick_patterns.is_hammer(cols, idx)
 
         exit_details['reversal_patterns'] = {
             'engulfing': {'bullish': bull_engulf, 'bearish': bear_engulf},
@@ -43,8 +47,8 @@ class ExitRules:
 
         # Check momentum
         momentum_score = self.momentum_patterns.calculate_momentum_score(
-            df, idx)
-        trend_strength = self.momentum_indicators.get_trend_strength(df, idx)
+            cols, idx)
+        trend_strength = cols['Trend_Strength'][idx]
 
         exit_details['momentum'] = {
             'score': momentum_score,
@@ -52,8 +56,12 @@ class ExitRules:
         }
 
         # Get indicator signals
-        indicator_signals = self.momentum_indicators.get_momentum_signals(
-            df, idx)
+        if signals is None:
+            indicator_signals = self.momentum_indicators.get_momentum_signals(
+                cols, idx)
+        else:
+            indicator_signals = {
+                name: values[idx] for name, values in signals.items()}
         exit_details['indicators'] = indicator_signals
 
         # Determine exit based on position type
@@ -76,35 +84,100 @@ class ExitRules:
 
         return should_exit, exit_details
 
-    def calculate_trailing_stop(self, df: pd.DataFrame, idx: int,
-                                position_type: str, entry_price: float) -> float:
-        """Calculate trailing stop level based on ATR and price action"""
+    def precompute_exit_signals(self, cols: Dict[str, np.ndarray],
+                                signals: Dict[str, np.ndarray],
+                                patterns: Dict[str, np.ndarray]
+                                ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Evaluate the check_exit_signals decision for every bar at once
+        signals: output of MomentumIndicators.precompute_signals
+        patterns: merged precompute_patterns output of both pattern classes
+        Returns: (exit_long, exit_short) boolean arrays
+        """
+        momentum_score = patterns['momentum_score']
+        trend_strength = cols['Trend_Strength']
+
+        exit_long = (
+            patterns['bearish_engulfing'] |
+            patterns['shooting_star'] |
+            ((momentum_score < -0.3) & (trend_strength < 0)) |
+            signals['macd_bearish_cross'] |
+            signals['rsi_overbought']
+        )
+
+        exit_short = (
+            patterns['bullish_engulfing'] |
+            patterns['hammer'] |
+            ((momentum_score > 0.3) & (trend_strength > 0)) |
+            signals['macd_bullish_cross'] |
+            signals['rsi_oversold']
+        )
+
+        exit_long[:1] = False
+        exit_short[:1] = False
+
+        return exit_long, exit_short
+
+    def precompute_trailing_stops(self, df: pd.DataFrame,
+                                  stop_distance: Optional[np.ndarray] = None
+                                  ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Calculate the ATR trailing levels for every bar at once
+        Levels are before the entry-price bound applied by
+        calculate_trailing_stop
+        stop_distance: optional precompute_dynamic_stops stop distances
+
+        Returns: (long_trail_levels, short_trail_levels)
+        """
+        if stop_distance is None:
+            stop_distance, _ = (
+                self.volatility_indicators.precompute_dynamic_stops(df))
+        close = df['Close'].to_numpy()
+
+        # Wider trailing stop
+        long_trail = close - (stop_distance * 1.5)
+        short_trail = close + (stop_distance * 1.5)
+
+        return long_trail, short_trail
+
+    def calculate_trailing_stop(self, cols: Dict[str, np.ndarray], idx: int,
+                                position_type: str, entry_price: float,
+                                trail_levels: Optional[Tuple[np.ndarray, np.ndarray]] = None
+                                ) -> float:
+        """
+        Calculate trailing stop level based on ATR and price action
+        trail_levels: optional output of precompute_trailing_stops
+        """
         if idx < 1:
             return entry_price
 
-        stop_distance, _ = self.volatility_indicators.get_dynamic_stops(
-            df, idx)
-        current_price = df['Close'].iloc[idx]
+        if trail_levels is None:
+            stop_distance, _ = self.volatility_indicators.get_dynamic_stops(
+                cols, idx)
+            current_price = cols['Close'][idx]
+            long_trail = current_price - \
+                (stop_distance * 1.5)  # Wider trailing stop
+            short_trail = current_price + (stop_distance * 1.5)
+        else:
+            long_trail = trail_levels[0][idx]
+            short_trail = trail_levels[1][idx]
 
         if position_type == 'long':
-            trail_level = current_price - \
-                (stop_distance * 1.5)  # Wider trailing stop
             # Don't go below entry - 1%
-            return max(trail_level, entry_price * 0.99)
+            return max(long_trail, entry_price * 0.99)
         else:
-            trail_level = current_price + (stop_distance * 1.5)
             # Don't go above entry + 1%
-            return min(trail_level, entry_price * 1.01)
+            return min(short_trail, entry_price * 1.01)
 
-    def should_move_stop_to_breakeven(self, df: pd.DataFrame, idx: int,
+    def should_move_stop_to_breakeven(self, cols: Dict[str, np.ndarray], idx: int,
                                       position_type: str, entry_price: float) -> bool:
         """Determine if stop loss should be moved to breakeven"""
         if idx < 1:
             return False
 
-        current_price = df['Close'].iloc[idx]
+        current_price = cols['Close'][idx]
         _, take_profit_distance = self.volatility_indicators.get_dynamic_stops(
-            df, idx)
+            cols, idx)
 
         if position_type == 'long':
             profit_target = entry_price + take_profit_distance
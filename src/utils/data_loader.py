@@ -1,5 +1,8 @@
+import numpy as np
 import pandas as pd
 import yfinance as yf
+import time
+from pathlib import Path
 from typing import Optional
 from datetime import datetime, timedelta
 
@@ -9,22 +12,65 @@ class DataLoader:
     def load_from_yahoo(symbol: str,
                         start_date: Optional[datetime] = None,
                         end_date: Optional[datetime] = None,
-                        interval: str = '1d') -> pd.DataFrame:
-        """Load historical data from Yahoo Finance"""
+                        interval: str = '1d',
+                        cache_dir: Optional[str] = '.cache',
+                        max_cache_age: timedelta = timedelta(days=1)) -> pd.DataFrame:
+        """
+        Load historical data from Yahoo Finance
+        Downloads are cached as Parquet files in cache_dir and reused while
+        younger than max_cache_age; cache_dir=None always downloads
+        """
         if start_date is None:
             start_date = datetime.now() - timedelta(days=365)
         if end_date is None:
             end_date = datetime.now()
 
+        cache_path = None
+        if cache_dir is not None:
+            cache_path = Path(cache_dir) / (
+                f"{symbol}_{start_date:%Y%m%d}_{end_date:%Y%m%d}_{interval}.parquet")
+            cached = DataLoader._read_cache(cache_path, max_cache_age)
+            if cached is not None:
+                return cached
+
         try:
             ticker = yf.Ticker(symbol)
             df = ticker.history(
                 start=start_date, end=end_date, interval=interval)
-            df.index = pd.to_datetime(df.index)
-            return df
+            # yfinance normally returns a DatetimeIndex already
+            if not isinstance(df.index, pd.DatetimeIndex):
+                df.index = pd.to_datetime(df.index)
         except Exception as e:
             raise Exception(f"Failed to load data for {symbol}: {str(e)}")
 
+        if cache_path is not None and not df.empty:
+            DataLoader._write_cache(df, cache_path)
+        return df
+
+    @staticmethod
+    def _read_cache(cache_path: Path, max_age: timedelta) -> Optional[pd.DataFrame]:
+        """Return a cached download, or None if it is missing or stale"""
+        try:
+            age = time.time() - cache_path.stat().st_mtime
+        except OSError:
+            return None
+        if age > max_age.total_seconds():
+            return None
+
+        try:
+            return pd.read_parquet(cache_path)
+        except (ImportError, OSError, ValueError):  # No Parquet engine or bad file
+            return None
+
+    @staticmethod
+    def _write_cache(df: pd.DataFrame, cache_path: Path):
+        """Save a download for reuse; skipped without a Parquet engine"""
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            df.to_parquet(cache_path, compression='zstd')
+        except (ImportError, OSError):
+            pass
+
     @staticmethod
     def load_from_csv(filepath: str,
                       date_column: str = 'Date',
@@ -34,7 +80,12 @@ class DataLoader:
             required_columns = ['Open', 'High', 'Low', 'Close', 'Volume']
 
         try:
-            df = pd.read_csv(filepath)
+            try:
+                # The pyarrow parser is multithreaded and parses dates natively
+                df = pd.read_csv(filepath, engine='pyarrow',
+                                 parse_dates=[date_column])
+            except ImportError:
+                df = pd.read_csv(filepath, parse_dates=[date_column])
 
             # Ensure required columns exist
             missing_cols = [
@@ -42,8 +93,9 @@ class DataLoader:
             if missing_cols:
                 raise ValueError(f"Missing required columns: {missing_cols}")
 
-            # Convert date column to datetime
-            df[date_column] = pd.to_datetime(df[date_column])
+            # Convert date column to datetime unless the parser already did
+            if not pd.api.types.is_datetime64_any_dtype(df[date_column]):
+                df[date_column] = pd.to_datetime(df[date_column])
             df.set_index(date_column, inplace=True)
 
             return df
@@ -53,10 +105,9 @@ class DataLoader:
     @staticmethod
     def preprocess_data(df: pd.DataFrame) -> pd.DataFrame:
         """Preprocess data for strategy use"""
-        df = df.copy()
-
-        # Remove rows with missing values
-        df.dropna(inplace=True)
+        # Remove rows with missing values; dropna returns a new frame, so
+        # the caller's df is left untouched
+        df = df.dropna()
 
         # Ensure all required columns are present
         required_cols = ['Open', 'High', 'Low', 'Close', 'Volume']
@@ -64,9 +115,17 @@ class DataLoader:
         if missing_cols:
             raise ValueError(f"Missing required columns: {missing_cols}")
 
-        # Add basic derived columns
-        df['Returns'] = df['Close'].pct_change()
-        df['Range'] = df['High'] - df['Low']
-        df['Body'] = abs(df['Close'] - df['Open'])
+        # float32 holds quoted prices and volumes with room to spare and
+        # halves the memory the indicator passes stream through; the
+        # indicators widen to float64 where they need it
+        df[required_cols] = df[required_cols].astype(np.float32)
+
+        # Add basic derived columns, on the raw arrays to skip index alignment
+        close = df['Close'].to_numpy()
+        returns = np.full(len(close), np.nan, dtype=close.dtype)
+        returns[1:] = close[1:] / close[:-1] - 1  # Same as pct_change()
+        df['Returns'] = returns
+        df['Range'] = np.subtract(df['High'].to_numpy(), df['Low'].to_numpy())
+        df['Body'] = np.abs(np.subtract(close, df['Open'].to_numpy()))
 
         return df
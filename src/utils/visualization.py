@@ -1,166 +1,489 @@
+import copy
+import hashlib
+from collections import OrderedDict
 import pandas as pd
 import numpy as np
 import plotly.graph_objects as go
+import plotly.io as pio
+from plotly.colors import get_colorscale
 from plotly.subplots import make_subplots
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple, Union
+from ..backtester.trade_log import TradeLog
+from .jit import njit, NUMBA_AVAILABLE
+
+try:
+    import orjson  # noqa: F401
+except ImportError:  # Figures serialize with plotly's default JSON encoder
+    pass
+else:
+    pio.json.config.default_engine = 'orjson'
+
+OHLCV_COLUMNS = ('Open', 'High', 'Low', 'Close', 'Volume')
+MONTH_LABELS = ('Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun',
+                'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec')
+
+# Expanded up front: plotly.js has no named 'RdYlGn' scale, and FAST
+# figures never reach the validator that would expand it
+_RETURNS_COLORSCALE = get_colorscale('RdYlGn')
+
+# Trade marker styles, shared by every chart
+_LONG_ENTRY_MARKER = dict(symbol='triangle-up', size=12, color='green')
+_LONG_EXIT_MARKER = dict(symbol='x', size=12, color='red')
+_SHORT_ENTRY_MARKER = dict(symbol='triangle-down', size=12, color='red')
+_SHORT_EXIT_MARKER = dict(symbol='x', size=12, color='green')
+
+_MARKERS = {
+    ('long', 'Entry'): _LONG_ENTRY_MARKER,
+    ('long', 'Exit'): _LONG_EXIT_MARKER,
+    ('short', 'Entry'): _SHORT_ENTRY_MARKER,
+    ('short', 'Exit'): _SHORT_EXIT_MARKER
+}
+
+# Per-point marker lookup tables, indexed by 2 * is_short + is_exit
+_MARKER_LABELS = np.array([f"{side.capitalize()} {leg}" for side, leg in _MARKERS])
+_MARKER_SYMBOLS = np.array([marker['symbol'] for marker in _MARKERS.values()])
+_MARKER_COLORS = np.array([marker['color'] for marker in _MARKERS.values()])
+
+
+def _subplot_skeleton(layout: Dict, **subplot_args) -> Dict:
+    """
+    Empty make_subplots figure with layout applied, as a dict with the
+    subplot grid that row/col placement needs
+    """
+    fig = make_subplots(**subplot_args)
+    fig.update_layout(layout)
+    skeleton = fig.to_dict()
+    skeleton['_grid_str'] = fig._grid_str
+    skeleton['_grid_ref'] = fig._grid_ref
+    return skeleton
+
+
+# Subplot layouts, titles included, are built and validated once; each
+# chart starts from a copy and needs no layout updates of its own
+_TRADING_SKELETON = _subplot_skeleton(
+    dict(
+        title=dict(text='Trading Strategy Performance'),
+        yaxis=dict(title=dict(text='Price')),
+        yaxis2=dict(title=dict(text='Volume')),
+        xaxis=dict(rangeslider=dict(visible=False))
+    ),
+    rows=2, cols=1,
+    shared_xaxes=True,
+    vertical_spacing=0.03,
+    row_heights=[0.7, 0.3]
+)
+_DASHBOARD_SKELETON = _subplot_skeleton(
+    dict(
+        title=dict(text='Strategy Performance Dashboard'),
+        showlegend=False,
+        height=800,
+        # Equity and drawdown x values are epoch milliseconds
+        xaxis=dict(type='date'),
+        xaxis3=dict(type='date')
+    ),
+    rows=2, cols=2,
+    subplot_titles=(
+        'Equity Curve',
+        'Monthly Returns',
+        'Drawdown',
+        'Win/Loss Distribution'
+    )
+)
+
+
+@njit(cache=True)
+def _drawdown_kernel(equity: np.ndarray) -> np.ndarray:
+    """Fractional drawdown from the running peak in one pass over equity"""
+    out = np.empty(equity.shape[0])
+    peak = -np.inf
+    for i in range(equity.shape[0]):
+        if equity[i] > peak:
+            peak = equity[i]
+        out[i] = equity[i] / peak - 1.0
+    return out
+
+
+# Built figures keyed by a digest of their traces, least recently used
+# first. Off by default: each figure pins its full trace data, and one-shot
+# renders would only pay for the digest. Set a size to cache re-renders
+FIGURE_CACHE_SIZE = 0
+_FIGURE_CACHE: 'OrderedDict[Tuple, Dict]' = OrderedDict()
+
+
+def _digest_into(digest, value) -> None:
+    """Feed a trace value into digest, arrays by their raw bytes"""
+    if isinstance(value, dict):
+        for key in sorted(value):
+            digest.update(key.encode())
+            _digest_into(digest, value[key])
+    elif isinstance(value, (list, tuple)) and any(
+            isinstance(item, (dict, list, tuple, np.ndarray, pd.Index))
+            for item in value):
+        digest.update(f'{type(value).__name__}{len(value)}'.encode())
+        for item in value:
+            _digest_into(digest, item)
+    elif isinstance(value, pd.DatetimeIndex):
+        digest.update(str(value.tz).encode())
+        _digest_into(digest, value.asi8)
+    elif isinstance(value, np.ndarray):
+        digest.update(f'{value.dtype}{value.shape}'.encode())
+        digest.update(np.ascontiguousarray(value).tobytes())
+    else:
+        digest.update(repr(value).encode())
 
 
 class StrategyVisualizer:
+    # When set, charts skip plotly validation entirely and are returned as
+    # plain figure dicts, which plotly.io and dashboard frameworks accept
+    FAST = False
+
     @staticmethod
     def create_trading_chart(df: pd.DataFrame,
-                             trades: List[Dict],
-                             indicators: Optional[List[str]] = None) -> go.Figure:
-        """Create interactive trading chart with trades and indicators"""
-        # Create figure with secondary y-axis
-        fig = make_subplots(rows=2, cols=1,
-                            shared_xaxes=True,
-                            vertical_spacing=0.03,
-                            row_heights=[0.7, 0.3])
-
-        # Add candlestick chart
-        fig.add_trace(
-            go.Candlestick(
-                x=df.index,
-                open=df['Open'],
-                high=df['High'],
-                low=df['Low'],
-                close=df['Close'],
+                             trades: Union[TradeLog, List[Dict]],
+                             indicators: Optional[List[str]] = None,
+                             max_points: int = 5000) -> Union[go.Figure, Dict]:
+        """
+        Create interactive trading chart with trades and indicators
+        Histories longer than max_points bars are drawn as OHLCV buckets of
+        consecutive bars; pass max_points=None to plot every bar
+        """
+        traces, rows = StrategyVisualizer._trading_traces(
+            df, trades, indicators, max_points)
+
+        # Price and volume rows
+        return StrategyVisualizer._build_figure(
+            _TRADING_SKELETON, traces, [(row, 1) for row in rows])
+
+    @staticmethod
+    def update_trading_chart(fig: go.Figure, df: pd.DataFrame,
+                             trades: Union[TradeLog, List[Dict]],
+                             max_points: int = 5000) -> go.Figure:
+        """
+        Refresh a create_trading_chart figure in place for new bars and
+        trades, for live charts that redraw every tick
+        Traces are matched by name and only their data is replaced, inside
+        one batch_update, so a FigureWidget (or Plotly.react) applies a
+        single diff instead of rebuilding and reserializing the figure
+        Returns: fig
+        """
+        indicators = [trace.name for trace in fig.data
+                      if trace.type == 'scattergl' and trace.name in df.columns]
+        traces, rows = StrategyVisualizer._trading_traces(
+            df, trades, indicators, max_points)
+
+        current = {trace.name: trace for trace in fig.data}
+        with fig.batch_update():
+            for trace in traces:
+                trace.pop('type')
+                current[trace['name']].update(trace)
+        return fig
+
+    @staticmethod
+    def _trading_traces(df: pd.DataFrame, trades: Union[TradeLog, List[Dict]],
+                        indicators: Optional[List[str]],
+                        max_points: Optional[int]) -> Tuple[List[Dict], List[int]]:
+        """
+        Trace dicts for the trading chart
+        Returns: (traces, subplot row of each trace)
+        """
+        x = StrategyVisualizer._index_values(df.index)
+        bars = {name: df[name].to_numpy() for name in OHLCV_COLUMNS}
+        ends = slice(None)
+        if max_points and len(df) > max_points:
+            bars, starts, ends = StrategyVisualizer._downsample_bars(
+                bars, max_points)
+            x = x[starts]
+
+        # Candlestick chart
+        traces = [
+            dict(
+                type='candlestick',
+                x=x,
+                open=bars['Open'],
+                high=bars['High'],
+                low=bars['Low'],
+                close=bars['Close'],
                 name='Price'
-            ),
-            row=1, col=1
-        )
+            )
+        ]
+        rows = [1]
 
-        # Add volume bars
-        fig.add_trace(
-            go.Bar(
-                x=df.index,
-                y=df['Volume'],
-                name='Volume'
-            ),
-            row=2, col=1
+        # Volume bars
+        traces.append(
+            dict(
+                type='bar',
+                x=x,
+                y=bars['Volume'],
+                name='Volume',
+                showlegend=False
+            )
         )
+        rows.append(2)
 
-        # Add indicators if specified
-        if indicators:
-            for indicator in indicators:
-                if indicator in df.columns:
-                    fig.add_trace(
-                        go.Scatter(
-                            x=df.index,
-                            y=df[indicator],
-                            name=indicator,
-                            line=dict(width=1)
-                        ),
-                        row=1, col=1
-                    )
-
-        # Add trades
-        for trade in trades:
-            # Entry point
-            fig.add_trace(
-                go.Scatter(
-                    x=[trade['entry_time']],
-                    y=[trade['entry_price']],
-                    mode='markers',
-                    marker=dict(
-                        symbol='triangle-up' if trade['type'] == 'long' else 'triangle-down',
-                        size=12,
-                        color='green' if trade['type'] == 'long' else 'red'
-                    ),
-                    name=f"{trade['type'].capitalize()} Entry"
-                ),
-                row=1, col=1
+        # Indicators if specified, as float32 overlays sampled like Close
+        overlays = [indicator for indicator in indicators or []
+                    if indicator in df.columns]
+        traces += [
+            dict(
+                type='scattergl',
+                x=x,
+                y=df[indicator].to_numpy(dtype=np.float32)[ends],
+                name=indicator,
+                line=dict(width=1)
             )
+            for indicator in overlays
+        ]
+        rows += [1] * len(overlays)
 
-            # Exit point
-            fig.add_trace(
-                go.Scatter(
-                    x=[trade['exit_time']],
-                    y=[trade['exit_price']],
-                    mode='markers',
-                    marker=dict(
-                        symbol='x',
-                        size=12,
-                        color='red' if trade['type'] == 'long' else 'green'
-                    ),
-                    name=f"{trade['type'].capitalize()} Exit"
-                ),
-                row=1, col=1
+        # Trades, all entries then all exits in one marker trace styled
+        # per point; it is there even without trades so live updates find
+        # the same traces
+        if not isinstance(trades, TradeLog):
+            trades = TradeLog.from_records(trades)
+
+        is_short = np.tile(trades.column('type') != 'long', 2)
+        is_exit = np.repeat([False, True], len(trades))
+        style = 2 * is_short + is_exit
+        traces.append(dict(
+            type='scattergl',
+            x=StrategyVisualizer._trade_times(trades, 'entry_time', 'exit_time'),
+            y=np.concatenate([trades.column('entry_price'),
+                              trades.column('exit_price')]),
+            mode='markers',
+            # String arrays go in as lists: orjson cannot encode NumPy
+            # str arrays and would hand the figure to the slow encoder
+            marker=dict(
+                symbol=_MARKER_SYMBOLS[style].tolist(),
+                size=12,
+                color=_MARKER_COLORS[style].tolist()
+            ),
+            text=_MARKER_LABELS[style].tolist(),
+            name='Trades',
+            legendgroup='trades',
+            showlegend=False
+        ))
+        rows.append(1)
+
+        # Empty stand-ins give the legend one entry per marker style,
+        # toggling the Trades trace through their shared group
+        traces += [
+            dict(
+                type='scattergl',
+                x=[None],
+                y=[None],
+                mode='markers',
+                marker=marker,
+                name=f"{side.capitalize()} {leg}",
+                legendgroup='trades'
             )
+            for (side, leg), marker in _MARKERS.items()
+        ]
+        rows += [1] * len(_MARKERS)
 
-        # Update layout
-        fig.update_layout(
-            title='Trading Strategy Performance',
-            yaxis_title='Price',
-            yaxis2_title='Volume',
-            xaxis_rangeslider_visible=False
-        )
+        return traces, rows
 
-        return fig
+    @staticmethod
+    def save_html(fig: Union[go.Figure, Dict], path) -> None:
+        """
+        Write a chart to HTML that loads plotly.js from the CDN instead of
+        inlining the ~3MB bundle in every file
+        Accepts go.Figure or FAST figure dicts
+        """
+        pio.write_html(fig, path, include_plotlyjs='cdn', validate=False,
+                       include_mathjax=False)
 
     @staticmethod
-    def create_performance_dashboard(performance_metrics: Dict) -> go.Figure:
-        """Create performance metrics dashboard"""
-        fig = make_subplots(
-            rows=2, cols=2,
-            subplot_titles=(
-                'Equity Curve',
-                'Monthly Returns',
-                'Drawdown',
-                'Win/Loss Distribution'
-            )
-        )
+    def _downsample_bars(bars: Dict[str, np.ndarray], max_points: int
+                         ) -> Tuple[Dict[str, np.ndarray], np.ndarray, np.ndarray]:
+        """
+        Aggregate consecutive bars into at most max_points OHLCV buckets
+        Returns: (bucketed bars, first bar of each bucket, last bar of each bucket)
+        """
+        n_bars = len(bars['Close'])
+        bucket = -(-n_bars // max_points)
+        starts = np.arange(0, n_bars, bucket)
+        ends = np.minimum(starts + bucket, n_bars) - 1
+
+        bucketed = {
+            'Open': bars['Open'][starts],
+            'High': np.maximum.reduceat(bars['High'], starts),
+            'Low': np.minimum.reduceat(bars['Low'], starts),
+            'Close': bars['Close'][ends],
+            'Volume': np.add.reduceat(bars['Volume'], starts)
+        }
+        return bucketed, starts, ends
+
+    @staticmethod
+    def _index_values(index: pd.Index):
+        """
+        Index values to plot along x
+        Naive datetimes pass as a datetime64 array; tz-aware ones keep the
+        index so plotly renders them in their own timezone
+        """
+        if getattr(index, 'tz', None) is not None:
+            return index
+        return index.to_numpy()
+
+    @staticmethod
+    def _trade_times(trades: TradeLog, *names: str):
+        """
+        Trade timestamps for plotting, in the log's timezone if it has one
+        Several time columns are concatenated in order
+        """
+        times = np.concatenate([trades.column(name) for name in names])
+        if trades.tz is None:
+            return times
+        return pd.DatetimeIndex(times, tz='UTC').tz_convert(trades.tz)
 
-        # Equity curve
-        fig.add_trace(
-            go.Scatter(
-                x=performance_metrics['equity_curve'].index,
-                y=performance_metrics['equity_curve'],
+    @staticmethod
+    def create_performance_dashboard(performance_metrics: Dict) -> Union[go.Figure, Dict]:
+        """
+        Create performance metrics dashboard
+        The drawdown is derived from the equity curve when the metrics do
+        not include one
+        """
+        equity = performance_metrics['equity_curve']
+        drawdown = performance_metrics.get('drawdown')
+        if drawdown is None:
+            drawdown = pd.Series(StrategyVisualizer._drawdown(equity.to_numpy()),
+                                 index=equity.index)
+
+        monthly_z, years = StrategyVisualizer._monthly_grid(
+            performance_metrics['monthly_returns'])
+
+        # Equity and drawdown are display-only, so float32 halves their
+        # encoded size at no visible cost, and epoch-millisecond x values
+        # encode as one typed array instead of a list of date strings
+        traces = [
+            # Equity curve
+            dict(
+                type='scatter',
+                x=StrategyVisualizer._epoch_ms(equity.index),
+                y=equity.to_numpy(dtype=np.float32),
                 name='Equity'
             ),
-            row=1, col=1
-        )
-
-        # Monthly returns heatmap
-        monthly_returns = performance_metrics['monthly_returns']
-        fig.add_trace(
-            go.Heatmap(
-                z=monthly_returns.values.reshape(-1),
-                x=monthly_returns.index,
-                colorscale='RdYlGn',
+            # Monthly returns heatmap
+            dict(
+                type='heatmap',
+                z=monthly_z,
+                x=MONTH_LABELS,
+                y=years,
+                colorscale=_RETURNS_COLORSCALE,
                 name='Monthly Returns'
             ),
-            row=1, col=2
-        )
-
-        # Drawdown
-        fig.add_trace(
-            go.Scatter(
-                x=performance_metrics['drawdown'].index,
-                y=performance_metrics['drawdown'],
+            # Drawdown
+            dict(
+                type='scatter',
+                x=StrategyVisualizer._epoch_ms(drawdown.index),
+                y=drawdown.to_numpy(dtype=np.float32),
                 fill='tozeroy',
                 name='Drawdown'
             ),
-            row=2, col=1
-        )
-
-        # Win/Loss distribution
-        fig.add_trace(
-            go.Bar(
+            # Win/Loss distribution
+            dict(
+                type='bar',
                 x=['Wins', 'Losses'],
                 y=[
                     performance_metrics['win_rate'],
                     1 - performance_metrics['win_rate']
                 ],
                 name='Win/Loss'
-            ),
-            row=2, col=2
-        )
+            )
+        ]
+        return StrategyVisualizer._build_figure(
+            _DASHBOARD_SKELETON, traces, [(1, 1), (1, 2), (2, 1), (2, 2)])
 
-        fig.update_layout(
-            title='Strategy Performance Dashboard',
-            showlegend=False,
-            height=800
-        )
+    @staticmethod
+    def _build_figure(skeleton: Dict, traces: List[Dict],
+                      cells: List[Tuple[int, int]]) -> Union[go.Figure, Dict]:
+        """
+        Place trace dicts on the skeleton's (row, col) subplots
+        Traces are plain dicts added in one add_traces call, so the figure
+        validates each trace once and rebuilds its data tuple once; figures
+        for traces seen before come from _FIGURE_CACHE instead
+        Returns: go.Figure, or a plain figure dict when FAST is set
+        """
+        key = None
+        if FIGURE_CACHE_SIZE > 0:
+            digest = hashlib.blake2b(digest_size=16)
+            _digest_into(digest, {'traces': traces, 'cells': cells})
+            key = (id(skeleton), StrategyVisualizer.FAST, digest.digest())
+
+            cached = _FIGURE_CACHE.get(key)
+            if cached is not None:
+                _FIGURE_CACHE.move_to_end(key)
+                if StrategyVisualizer.FAST:
+                    return copy.deepcopy(cached)
+                return go.Figure(copy.deepcopy(cached), _validate=False)
 
+        if StrategyVisualizer.FAST:
+            grid = skeleton['_grid_ref']
+            for trace, (row, col) in zip(traces, cells):
+                trace.update(grid[row - 1][col - 1][0].trace_kwargs)
+            fig = {'data': traces, 'layout': copy.deepcopy(skeleton['layout'])}
+        else:
+            fig = go.Figure(copy.deepcopy(skeleton), _validate=False)
+            rows, cols = zip(*cells)
+            fig.add_traces(traces, rows=list(rows), cols=list(cols))
+
+        if key is not None:
+            if StrategyVisualizer.FAST:
+                cached = copy.deepcopy(fig)
+            else:
+                # The validated trace props keep their arrays as arrays,
+                # unlike to_dict(), which base64-encodes them
+                cached = {
+                    'data': copy.deepcopy(fig._data),
+                    'layout': copy.deepcopy(fig._layout),
+                    '_grid_str': skeleton['_grid_str'],
+                    '_grid_ref': skeleton['_grid_ref']
+                }
+            _FIGURE_CACHE[key] = cached
+            while len(_FIGURE_CACHE) > FIGURE_CACHE_SIZE:
+                _FIGURE_CACHE.popitem(last=False)
         return fig
+
+    @staticmethod
+    def clear_cache() -> None:
+        """Drop every cached figure"""
+        _FIGURE_CACHE.clear()
+
+    @staticmethod
+    def _drawdown(equity: np.ndarray) -> np.ndarray:
+        """
+        Fractional drawdown of equity from its running peak
+        Returns: equity / running peak - 1, 0 at each new high
+        """
+        equity = np.ascontiguousarray(equity, dtype=np.float64)
+        if NUMBA_AVAILABLE:
+            return _drawdown_kernel(equity)
+        return equity / np.maximum.accumulate(equity) - 1.0
+
+    @staticmethod
+    def _epoch_ms(index: pd.DatetimeIndex) -> np.ndarray:
+        """
+        Wall-clock times as float64 milliseconds since the epoch, the
+        numeric form plotly.js reads on a date axis
+        """
+        index = pd.DatetimeIndex(index)
+        if index.tz is not None:
+            index = index.tz_localize(None)
+        return (index.asi8 // 1_000_000).astype(np.float64)
+
+    @staticmethod
+    def _monthly_grid(monthly_returns: pd.Series) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Lay monthly returns out as a year x month grid, NaN where a month
+        has no return
+        Returns: (grid of shape (n_years, 12), years)
+        """
+        index = pd.DatetimeIndex(monthly_returns.index)
+        if len(index) == 0:
+            return np.empty((0, 12)), np.empty(0, dtype=np.int64)
+
+        years = index.year.to_numpy()
+        first_year = years.min()
+        grid = np.full((years.max() - first_year + 1, 12), np.nan)
+        grid[years - first_year, index.month.to_numpy() - 1] = (
+            monthly_returns.to_numpy())
+        return grid, np.arange(first_year, years.max() + 1)